@@ -1,10 +1,14 @@
 """Canvas: assembles Panes into a full frame."""
 
 import logging
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
 import cv2
 import numpy as np
+import torch
 
 from filterworld.canvas.pane import Pane
 from filterworld.config import Config
@@ -15,11 +19,18 @@ from filterworld.layers.image_layer import ImageLayer
 
 logger = logging.getLogger(__name__)
 
-# maps layer type strings to Layer classes
-_LAYER_REGISTRY: dict[str, type[Layer]] = {
+# maps layer type strings to Layer classes; read-only
+_LAYER_REGISTRY: MappingProxyType[str, type[Layer]] = MappingProxyType({
     'image': ImageLayer,
     'feature': FeatureLayer,
-}
+})
+
+# maps pane interpolation names to cv2 resize flags; read-only
+_INTERPOLATIONS: MappingProxyType[str, int] = MappingProxyType({
+    'nearest': cv2.INTER_NEAREST,
+    'linear': cv2.INTER_LINEAR,
+    'area': cv2.INTER_AREA,
+})
 
 
 def _build_layer(layer_dict: dict) -> Layer:
@@ -34,15 +45,64 @@ def _build_layer(layer_dict: dict) -> Layer:
     Raises:
         ValueError: if the layer type is unknown
     """
-    layer_dict = dict(layer_dict)  # shallow copy to avoid mutating config
-    layer_type = layer_dict.pop('type', 'image')
+    layer_type = layer_dict.get('type', 'image')
     cls = _LAYER_REGISTRY.get(layer_type)
     if cls is None:
         raise ValueError(
             f'unknown layer type: {layer_type!r}. '
             f'available types: {list(_LAYER_REGISTRY.keys())}'
         )
-    return cls(**layer_dict)
+    # build kwargs without the type key; the config dict itself is not mutated
+    return cls(**{k: v for k, v in layer_dict.items() if k != 'type'})
+
+
+def _interpolation_flag(name: str | None) -> int | None:
+    """Look up the cv2 resize flag for a pane interpolation name.
+
+    Args:
+        name: interpolation name, or None to choose automatically per frame
+
+    Returns:
+        cv2 interpolation flag, or None for automatic selection
+
+    Raises:
+        ValueError: if the interpolation name is unknown
+    """
+    if name is None:
+        return None
+    flag = _INTERPOLATIONS.get(name)
+    if flag is None:
+        raise ValueError(
+            f'unknown interpolation: {name!r}. '
+            f'available interpolations: {list(_INTERPOLATIONS.keys())}'
+        )
+    return flag
+
+
+def _resize_interpolation(src: np.ndarray, dst_w: int, dst_h: int) -> int:
+    """Pick the cv2 interpolation flag for resizing an image to a cell.
+
+    Integer-factor downscales use INTER_AREA, which averages whole pixel
+    blocks (no aliasing) and runs on OpenCV's fast area path at the same
+    cost as INTER_LINEAR. Other ratios use INTER_LINEAR, since the general
+    INTER_AREA path is several times slower.
+
+    Args:
+        src: source image of shape (H, W, 3)
+        dst_w: target width in pixels
+        dst_h: target height in pixels
+
+    Returns:
+        cv2 interpolation flag
+    """
+    src_h, src_w = src.shape[:2]
+    if (
+        src_w >= dst_w and src_h >= dst_h
+        and (src_w, src_h) != (dst_w, dst_h)
+        and src_w % dst_w == 0 and src_h % dst_h == 0
+    ):
+        return cv2.INTER_AREA
+    return cv2.INTER_LINEAR
 
 
 class Layout(ABC):
@@ -61,11 +121,14 @@ class Layout(ABC):
     def arrange(
         self,
         rendered_panes: list[np.ndarray],
+        interpolations: list[int | None] | None = None,
     ) -> np.ndarray:
         """Arrange rendered pane images into a single output frame.
 
         Args:
             rendered_panes: list of composited pane images
+            interpolations: optional cv2 resize flag per pane; None entries
+                (or no list) let the layout choose
 
         Returns:
             final output frame of shape (height, width, 3), dtype uint8
@@ -79,24 +142,112 @@ class GridLayout(Layout):
     Panes are placed left-to-right, top-to-bottom. Each cell is sized
     to fit evenly within the output dimensions.
 
+    The output frame is allocated on the first call to `arrange` and reused
+    for subsequent frames, so the returned frame is overwritten by the next
+    call. Panes are resized directly into their cell of the output frame.
+
+    With `use_opencl`, the resizes run on OpenCV's OpenCL device (e.g. an
+    integrated GPU) instead: each pane is uploaded once, resized into a cell
+    of a device-side output frame, and the composed frame is downloaded once.
+    OpenCV's Python bindings cannot download into an existing array, so on
+    this path each call returns the freshly downloaded frame.
+
     Args:
         width: output frame width in pixels
         height: output frame height in pixels
         n_cols: number of columns in the grid
+        use_opencl: whether to compose on the OpenCL device
     """
 
-    def __init__(self, width: int, height: int, n_cols: int = 2) -> None:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        n_cols: int = 2,
+        use_opencl: bool = False,
+    ) -> None:
         super().__init__(width, height)
         self.n_cols = n_cols
+        self.use_opencl = use_opencl
+        self._output: np.ndarray | None = None
+        self._cells: list[np.ndarray] = []
+        # device-side output frame and cell regions, when using opencl
+        self._output_umat: cv2.UMat | None = None
+        self._cells_umat: list[cv2.UMat] = []
+
+    def _ensure_output(self, n_panes: int) -> None:
+        """Allocate the output frame and per-pane cell views for a pane count.
+
+        Only the regions no pane covers are zeroed, and only at allocation
+        time; afterwards each frame overwrites the same cells, so any
+        uncovered margin stays black.
+
+        Args:
+            n_panes: number of panes to arrange
+        """
+        if self._output is not None and len(self._cells) == n_panes:
+            return
+
+        self._output = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        # single pane: resize to fill the whole frame
+        if n_panes == 1:
+            self._cells = [self._output]
+            self._ensure_output_umat([(0, self.height, 0, self.width)])
+            return
+
+        n_rows = (n_panes + self.n_cols - 1) // self.n_cols
+        cell_w = self.width // self.n_cols
+        cell_h = self.height // n_rows
+
+        # view the tiled region as (row, y, col, x, channel); a cell is then a
+        # single index into the view rather than slice arithmetic per frame
+        grid = self._output[:n_rows * cell_h, :self.n_cols * cell_w].reshape(
+            n_rows, cell_h, self.n_cols, cell_w, 3,
+        )
+        self._cells = [
+            grid[idx // self.n_cols, :, idx % self.n_cols] for idx in range(n_panes)
+        ]
+
+        # black out the strips left over by integer cell sizes and any empty
+        # cells in the last row
+        self._output[n_rows * cell_h:] = 0
+        self._output[:, self.n_cols * cell_w:] = 0
+        for idx in range(n_panes, n_rows * self.n_cols):
+            grid[idx // self.n_cols, :, idx % self.n_cols] = 0
+
+        rects = []
+        for idx in range(n_panes):
+            y0 = (idx // self.n_cols) * cell_h
+            x0 = (idx % self.n_cols) * cell_w
+            rects.append((y0, y0 + cell_h, x0, x0 + cell_w))
+        self._ensure_output_umat(rects)
+
+    def _ensure_output_umat(self, rects: list[tuple[int, int, int, int]]) -> None:
+        """Mirror the output frame on the OpenCL device, if enabled.
+
+        Args:
+            rects: (y0, y1, x0, x1) cell region of each pane
+        """
+        if not self.use_opencl:
+            return
+        # upload the host frame so the uncovered regions start out black
+        self._output_umat = cv2.UMat(self._output)
+        self._cells_umat = [
+            cv2.UMat(self._output_umat, (y0, y1), (x0, x1)) for y0, y1, x0, x1 in rects
+        ]
 
     def arrange(
         self,
         rendered_panes: list[np.ndarray],
+        interpolations: list[int | None] | None = None,
     ) -> np.ndarray:
         """Arrange rendered pane images in a grid.
 
         Args:
             rendered_panes: list of composited pane images
+            interpolations: optional cv2 resize flag per pane; None entries
+                (or no list) pick one from the resize ratio
 
         Returns:
             final output frame of shape (height, width, 3), dtype uint8
@@ -105,24 +256,29 @@ class GridLayout(Layout):
         if n_panes == 0:
             return np.zeros((self.height, self.width, 3), dtype=np.uint8)
 
-        # single pane: just resize to fill
-        if n_panes == 1:
-            return cv2.resize(rendered_panes[0], (self.width, self.height))
-
-        n_rows = (n_panes + self.n_cols - 1) // self.n_cols
-        cell_w = self.width // self.n_cols
-        cell_h = self.height // n_rows
-
-        output = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        for idx, pane_img in enumerate(rendered_panes):
-            row = idx // self.n_cols
-            col = idx % self.n_cols
-            resized = cv2.resize(pane_img, (cell_w, cell_h))
-            y_start = row * cell_h
-            x_start = col * cell_w
-            output[y_start:y_start + cell_h, x_start:x_start + cell_w] = resized
-
-        return output
+        self._ensure_output(n_panes)
+        interpolations = interpolations or [None] * n_panes
+        for idx, (pane_img, cell, interp) in enumerate(
+            zip(rendered_panes, self._cells, interpolations),
+        ):
+            cell_h, cell_w = cell.shape[:2]
+            if interp is None:
+                interp = _resize_interpolation(pane_img, cell_w, cell_h)
+            if self.use_opencl:
+                cv2.resize(
+                    cv2.UMat(pane_img), (cell_w, cell_h),
+                    dst=self._cells_umat[idx], interpolation=interp,
+                )
+            else:
+                # resize straight into the cell view; opencv writes in place
+                # when dst already has the target shape and dtype
+                cv2.resize(pane_img, (cell_w, cell_h), dst=cell, interpolation=interp)
+
+        if self.use_opencl:
+            # single download of the composed frame, handed back as is rather
+            # than copied again into the host buffer
+            return self._output_umat.get()
+        return self._output
 
 
 class Canvas:
@@ -132,20 +288,46 @@ class Canvas:
     panes are configured, creates a default single-pane canvas that
     renders the original frame.
 
+    Canvases with more than one pane render them concurrently on a thread
+    pool; the heavy lifting happens in OpenCV and NumPy calls that release
+    the GIL. Call `close` to shut the pool down.
+
     Args:
         config: parsed Config instance
+        use_gpu: whether filter outputs may stay on the GPU, so layers reduce
+            them on-device and copy only display-sized images to the host;
+            None auto-detects CUDA
     """
 
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, use_gpu: bool | None = None) -> None:
         self._config = config
+        self.use_gpu = torch.cuda.is_available() if use_gpu is None else use_gpu
         self.panes: list[Pane] = []
         self.layout: Layout | None = None
+        self._interpolations: list[int | None] = []
+        self._frame_size: tuple[int, int] | None = None
+        # whether the output is exactly the input frame; set per frame size
+        self._passthrough = False
 
         if config.panes:
             self._build_from_config()
         else:
             self._build_default()
 
+        self._interpolations = [_interpolation_flag(pane.interpolation) for pane in self.panes]
+
+        self._pool: ThreadPoolExecutor | None = None
+        if len(self.panes) > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=min(len(self.panes), os.cpu_count() or 1),
+                thread_name_prefix='filterworld-pane',
+            )
+
+    @property
+    def requires_filter_output(self) -> bool:
+        """Whether any layer reads the filter output when rendering."""
+        return any(layer.uses_filter_output for pane in self.panes for layer in pane.layers)
+
     def _build_default(self) -> None:
         """Build a default single-pane canvas with an image layer."""
         pane = Pane(layers=[ImageLayer()], label='original')
@@ -155,14 +337,19 @@ class Canvas:
         """Build panes from configuration."""
         for pane_cfg in self._config.panes:
             layers = [_build_layer(layer_dict) for layer_dict in pane_cfg.layers]
-            pane = Pane(layers=layers, label=pane_cfg.label)
+            pane = Pane(
+                layers=layers,
+                label=pane_cfg.label,
+                interpolation=pane_cfg.interpolation,
+            )
             self.panes.append(pane)
 
     def _init_layout(self, frame_width: int, frame_height: int) -> None:
         """Initialize layout from config and frame dimensions.
 
         Uses config output width/height if set, otherwise falls back
-        to the input frame dimensions.
+        to the input frame dimensions. Pane buffers sized for a previous
+        frame size are released.
 
         Args:
             frame_width: input frame width in pixels
@@ -181,10 +368,26 @@ class Canvas:
         h = output_cfg.height or frame_height * n_rows
 
         if layout_cfg.type == 'grid':
-            self.layout = GridLayout(width=w, height=h, n_cols=layout_cfg.cols)
+            self.layout = GridLayout(
+                width=w, height=h, n_cols=layout_cfg.cols, use_opencl=layout_cfg.opencl,
+            )
         else:
             raise ValueError(f'unsupported layout type: {layout_cfg.type}')
 
+        self._frame_size = (frame_width, frame_height)
+        for pane in self.panes:
+            pane.reset_buffers()
+
+        # a single opaque image layer at the input size reproduces the frame
+        layers = self.panes[0].layers
+        self._passthrough = (
+            n_panes == 1
+            and len(layers) == 1
+            and isinstance(layers[0], ImageLayer)
+            and layers[0].opaque
+            and (w, h) == (frame_width, frame_height)
+        )
+
     def render(
         self,
         frame: np.ndarray,
@@ -197,13 +400,29 @@ class Canvas:
             filter_output: output from the filter for this frame
 
         Returns:
-            final output frame, dtype uint8
+            final output frame, dtype uint8; the buffer is owned by the layout
+            and is overwritten by the next call. When the canvas would only
+            reproduce the input, the input frame itself is returned.
         """
-        if self.layout is None:
-            h, w = frame.shape[:2]
+        h, w = frame.shape[:2]
+        if self._frame_size != (w, h):
             self._init_layout(w, h)
 
-        rendered_panes = [
-            pane.render(frame, filter_output) for pane in self.panes
-        ]
-        return self.layout.arrange(rendered_panes)
+        if self._passthrough:
+            return frame
+
+        if self._pool is None:
+            rendered_panes = [
+                pane.render(frame, filter_output) for pane in self.panes
+            ]
+        else:
+            rendered_panes = list(self._pool.map(
+                lambda pane: pane.render(frame, filter_output), self.panes,
+            ))
+        return self.layout.arrange(rendered_panes, self._interpolations)
+
+    def close(self) -> None:
+        """Shut down the pane rendering thread pool, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -9,22 +9,30 @@ from filterworld.layers.base import Layer
 class Pane:
     """A single panel that composites a stack of layers.
 
-    A Pane holds an ordered list of Layers. When rendered, it creates a
-    blank target image and applies each layer in order, producing a
-    single composited image.
+    A Pane holds an ordered list of Layers. When rendered, it applies each
+    layer in order onto a blank target image, producing a single
+    composited image. Layers draw in place into one target buffer that is
+    allocated once and reused across frames; it is only cleared when the
+    bottom layer is not opaque. Call `reset_buffers` to release it, e.g.
+    when the frame size changes.
 
     Args:
         layers: ordered list of layers to composite, bottom to top
         label: optional display label for this pane
+        interpolation: how the layout resizes this pane into its cell
+            ('nearest', 'linear' or 'area'); None chooses from the resize ratio
     """
 
     def __init__(
         self,
         layers: list[Layer] | None = None,
         label: str | None = None,
+        interpolation: str | None = None,
     ) -> None:
         self.layers = layers or []
         self.label = label
+        self.interpolation = interpolation
+        self._target: np.ndarray | None = None
 
     def add_layer(self, layer: Layer) -> None:
         """Append a layer to the top of the stack.
@@ -34,6 +42,10 @@ class Pane:
         """
         self.layers.append(layer)
 
+    def reset_buffers(self) -> None:
+        """Release the reusable target buffer; it is reallocated on demand."""
+        self._target = None
+
     def render(
         self,
         frame: np.ndarray,
@@ -46,10 +58,17 @@ class Pane:
             filter_output: output from the filter for this frame
 
         Returns:
-            composited image of shape (H, W, 3), dtype uint8
+            composited image of shape (H, W, 3), dtype uint8; may be a buffer
+            owned by the pane that is overwritten on the next call
         """
         h, w = frame.shape[:2]
-        target = np.zeros((h, w, 3), dtype=np.uint8)
+        if self._target is None or self._target.shape[:2] != (h, w):
+            self._target = np.empty((h, w, 3), dtype=np.uint8)
+        target = self._target
+
+        # an opaque bottom layer covers every pixel, so clearing is wasted work
+        if not (self.layers and self.layers[0].opaque):
+            target.fill(0)
         for layer in self.layers:
-            target = layer.render(target, frame, filter_output)
+            layer.render(target, frame, filter_output)
         return target
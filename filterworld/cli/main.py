@@ -20,6 +20,27 @@ def _derive_output_path(video_path: str) -> str:
     return str(p.with_stem(f'{p.stem}_filtered'))
 
 
+def _positive_int(value: str) -> int:
+    """Parse a command-line value as an integer of at least 1.
+
+    Args:
+        value: raw argument string
+
+    Returns:
+        the parsed integer
+
+    Raises:
+        argparse.ArgumentTypeError: if value is not a positive integer
+    """
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value: {value!r}') from None
+    if parsed < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {parsed}')
+    return parsed
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command-line arguments.
 
@@ -64,6 +85,12 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=None,
         help='model input resolution in pixels (default: model default)',
     )
+    parser_run.add_argument(
+        '--batch-size',
+        type=_positive_int,
+        default=None,
+        help='frames per model forward pass (default: model default)',
+    )
 
     # --- precompute subcommand ---
     parser_precompute = subparsers.add_parser(
@@ -90,6 +117,43 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         help='max frames to use for PCA fitting (default: 200)',
     )
     parser_precompute.add_argument(
+        '--batch-size',
+        type=_positive_int,
+        default=32,
+        help='frames per model forward pass (default: 32)',
+    )
+    parser_precompute.add_argument(
+        '--resolution',
+        type=int,
+        default=None,
+        help='model input resolution in pixels (default: model default)',
+    )
+
+    # --- extract subcommand ---
+    parser_extract = subparsers.add_parser(
+        'extract',
+        help='save model features for every frame, for replay with `run`',
+    )
+    parser_extract.add_argument(
+        'video',
+        help='path to input mp4 file',
+    )
+    parser_extract.add_argument(
+        'model',
+        help='model name (e.g. dinov1-small, dinov2-base)',
+    )
+    parser_extract.add_argument(
+        '--output', '-o',
+        required=True,
+        help='output .npy path for the features',
+    )
+    parser_extract.add_argument(
+        '--batch-size',
+        type=_positive_int,
+        default=32,
+        help='frames per model forward pass (default: 32)',
+    )
+    parser_extract.add_argument(
         '--resolution',
         type=int,
         default=None,
@@ -107,16 +171,20 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 def main(argv: list[str] | None = None) -> None:
     """Entry point for the filterworld CLI.
 
+    Subcommand implementations are imported inside their branch, since they
+    pull in torch and transformers; `--help` and argument errors exit from
+    `parse_args` before any of that, or logging setup, happens.
+
     Args:
         argv: argument list to parse, defaults to sys.argv[1:]
     """
+    args = parse_args(argv)
+
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s %(name)s %(levelname)s    %(message)s',
     )
 
-    args = parse_args(argv)
-
     if args.command == 'run':
         from filterworld.pipeline import Pipeline
 
@@ -127,6 +195,7 @@ def main(argv: list[str] | None = None) -> None:
             config_path=args.config,
             output_path=output_path,
             resolution=args.resolution,
+            batch_size=args.batch_size,
         )
         pipeline.run()
 
@@ -138,6 +207,18 @@ def main(argv: list[str] | None = None) -> None:
             model_path=args.model,
             output_path=args.output,
             max_frames=args.max_frames,
+            batch_size=args.batch_size,
+            resolution=args.resolution,
+        )
+
+    elif args.command == 'extract':
+        from filterworld.precompute import precompute_features
+
+        precompute_features(
+            video_path=args.video,
+            model_path=args.model,
+            output_path=args.output,
+            batch_size=args.batch_size,
             resolution=args.resolution,
         )
 
@@ -8,6 +8,9 @@ import yaml
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when available, several times faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 @dataclass
 class LayoutConfig:
@@ -17,11 +20,13 @@ class LayoutConfig:
         type: layout type, currently only 'grid' is supported
         rows: number of rows in the grid
         cols: number of columns in the grid
+        opencl: whether to compose the grid on OpenCV's OpenCL device
     """
 
     type: str = 'grid'
     rows: int = 1
     cols: int = 1
+    opencl: bool = False
 
 
 @dataclass
@@ -31,10 +36,13 @@ class PaneConfig:
     Args:
         layers: list of layer definitions (to be fleshed out later)
         label: optional display label
+        interpolation: how the pane is resized into its layout cell
+            ('nearest', 'linear' or 'area'); null chooses automatically
     """
 
     layers: list[dict] = field(default_factory=list)
     label: str | None = None
+    interpolation: str | None = None
 
 
 @dataclass
@@ -43,7 +51,9 @@ class OutputConfig:
 
     Args:
         fps: output fps; null means use the input video's fps
-        codec: four-character codec code
+        codec: four-character OpenCV codec code (e.g. 'mp4v', 'avc1'), or an
+            ffmpeg encoder name (e.g. 'libx264', 'h264_nvenc') to encode with
+            an ffmpeg subprocess
         width: output frame width in pixels; null means use input width
         height: output frame height in pixels; null means use input height
     """
@@ -86,13 +96,14 @@ def load_config(config_path: str | None) -> Config:
         raise FileNotFoundError(f'config file not found: {config_path}')
 
     logger.info('loading config from %s', path)
-    raw = yaml.safe_load(path.read_text()) or {}
+    raw = yaml.load(path.read_text(), Loader=_YAML_LOADER) or {}
 
     layout_raw = raw.get('layout', {})
     layout = LayoutConfig(
         type=layout_raw.get('type', 'grid'),
         rows=layout_raw.get('rows', 1),
         cols=layout_raw.get('cols', 1),
+        opencl=layout_raw.get('opencl', False),
     )
 
     panes_raw = raw.get('panes', []) or []
@@ -100,6 +111,7 @@ def load_config(config_path: str | None) -> Config:
         PaneConfig(
             layers=p.get('layers', []),
             label=p.get('label'),
+            interpolation=p.get('interpolation'),
         )
         for p in panes_raw
     ]
@@ -2,56 +2,65 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import numpy as np
 
+if TYPE_CHECKING:
+    import torch
 
-@dataclass
+
+@dataclass(slots=True)
 class FilterOutput:
     """Base container for filter results.
 
+    Outputs are slotted and carry no metadata dict unless one is supplied,
+    keeping the per-frame objects small.
+
     Args:
         frame_idx: index of the frame that produced this output
-        metadata: arbitrary key-value pairs for extra information
+        metadata: arbitrary key-value pairs for extra information; None when
+            there is nothing to report
     """
 
     frame_idx: int = 0
-    metadata: dict = field(default_factory=dict)
+    metadata: dict | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BBoxOutput(FilterOutput):
     """Bounding box detection results."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class SegmentationOutput(FilterOutput):
     """Segmentation mask results."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class FeatureOutput(FilterOutput):
     """Feature extraction results.
 
     Args:
-        features: spatial feature tensor of shape (D, H, W)
+        features: spatial feature tensor of shape (D, H, W); a torch tensor on
+            the model device when the filter's `keep_on_device` is set
     """
 
-    features: np.ndarray = field(default_factory=lambda: np.empty(0))
+    features: 'np.ndarray | torch.Tensor' = field(default_factory=lambda: np.empty(0))
 
 
-@dataclass
+@dataclass(slots=True)
 class KeypointOutput(FilterOutput):
     """Keypoint detection results."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DepthOutput(FilterOutput):
     """Depth estimation results."""
 
@@ -62,9 +71,20 @@ class Filter(ABC):
     """Base class for all filters.
 
     Subclasses must implement `process_frame` to transform a video frame
-    into a `FilterOutput`.
+    into a `FilterOutput`. Filters that can run several frames through
+    their model at once override `process_batch` as well.
+
+    Attributes:
+        keep_on_device: when True, filters backed by a torch model return
+            their outputs as tensors on the model device instead of copying
+            them to numpy; set by the pipeline when the canvas can consume them
+        batch_size: number of frames the pipeline buffers before calling
+            `process_batch`
     """
 
+    keep_on_device: bool = False
+    batch_size: int = 1
+
     @abstractmethod
     def process_frame(self, frame: np.ndarray) -> FilterOutput:
         """Process a single video frame.
@@ -76,3 +96,16 @@ class Filter(ABC):
             filter output containing model results for this frame
         """
         ...
+
+    def process_batch(self, frames: list[np.ndarray]) -> list[FilterOutput]:
+        """Process consecutive video frames.
+
+        The default implementation calls `process_frame` on each frame.
+
+        Args:
+            frames: list of numpy arrays of shape (H, W, 3) in RGB order, dtype uint8
+
+        Returns:
+            one filter output per frame, in order
+        """
+        return [self.process_frame(frame) for frame in frames]
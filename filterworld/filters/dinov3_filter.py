@@ -1,14 +1,9 @@
 """DINOv3 ViT feature extraction filter."""
 
-import logging
-
-import numpy as np
 import torch
 from transformers import AutoImageProcessor, AutoModel
 
-from filterworld.filters.base import FeatureOutput, Filter
-
-logger = logging.getLogger(__name__)
+from filterworld.filters.vit_filter import ViTFilter
 
 _DINOV3_ACCESS_HELP = """
 ================================================================================
@@ -50,71 +45,38 @@ For more information, visit: https://huggingface.co/docs/hub/security-tokens
 """
 
 
-class DINOv3Filter(Filter):
+class DINOv3Filter(ViTFilter):
     """Extracts spatial features from frames using a DINOv3 model.
 
     DINOv3 models are gated on HuggingFace and require authentication.
     Handles CLS and register tokens automatically based on model config.
-
-    Args:
-        model_name: Hugging Face model identifier
-            (e.g. 'facebook/dinov3-vits16-pretrain-lvd1689m')
-        resolution: input image resolution in pixels; must be divisible by patch_size.
-            None uses the model default (typically 224).
+    See `ViTFilter` for the arguments; model names look like
+    'facebook/dinov3-vits16-pretrain-lvd1689m'.
     """
 
-    def __init__(self, model_name: str, resolution: int | None = None) -> None:
-        self.model_name = model_name
-        self.resolution = resolution
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        logger.info('loading DINOv3 model %s on %s', model_name, self.device)
-
-        processor_kwargs = {}
-        if resolution is not None:
-            processor_kwargs['size'] = {'height': resolution, 'width': resolution}
-            processor_kwargs['crop_size'] = {'height': resolution, 'width': resolution}
-
-        self.processor, self.model = _load_dinov3(model_name, processor_kwargs)
-        self.model.eval()
-        self.model.to(self.device)
+    _family = 'DINOv3'
+    # DINOv3's processor rescales to [0, 1] before resizing, so the resize is
+    # not quantized
+    _rescale_first = True
 
-        self._num_prefix = 1 + getattr(self.model.config, 'num_register_tokens', 0)
-        self._patch_size = self.model.config.patch_size
-        self._frame_idx = 0
+    def _load_model(
+        self,
+        model_name: str,
+        processor_kwargs: dict,
+    ) -> tuple[AutoImageProcessor, AutoModel]:
+        """Load the DINOv3 processor and model."""
+        return _load_dinov3(model_name, processor_kwargs)
 
-    def process_frame(self, frame: np.ndarray) -> FeatureOutput:
-        """Extract spatial features from a single video frame.
+    def _compile_model(self) -> None:
+        """Compile the forward pass.
 
-        Args:
-            frame: numpy array of shape (H, W, 3) in RGB order, dtype uint8
-
-        Returns:
-            FeatureOutput with features of shape (D, H_feat, W_feat)
+        max-autotune fuses the forward pass and also captures it as a CUDA
+        graph, replayed every call.
         """
-        inputs = self.processor(images=frame, return_tensors='pt')
-        pixel_values = inputs['pixel_values'].to(self.device)
-
-        with torch.no_grad():
-            outputs = self.model(
-                pixel_values,
-                output_hidden_states=False,
-            ).last_hidden_state  # (1, S + num_prefix, D)
-
-        # skip CLS + register tokens
-        hidden = outputs[:, self._num_prefix:, :]  # (1, S, D)
-
-        # reshape to spatial grid
-        _, h_in, w_in = pixel_values.shape[0], pixel_values.shape[2], pixel_values.shape[3]
-        h_feat = h_in // self._patch_size
-        w_feat = w_in // self._patch_size
-
-        features = hidden[0].reshape(h_feat, w_feat, -1).permute(2, 0, 1)  # (D, H, W)
-        features_np = features.cpu().numpy()
-
-        idx = self._frame_idx
-        self._frame_idx += 1
-
-        return FeatureOutput(frame_idx=idx, features=features_np)
+        # any matmuls left in float32 may use tensor cores
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        self.model = torch.compile(self.model, mode='max-autotune')
 
 
 def _load_dinov3(
@@ -135,7 +97,9 @@ def _load_dinov3(
     """
     try:
         processor = AutoImageProcessor.from_pretrained(model_name, **processor_kwargs)
-        model = AutoModel.from_pretrained(model_name)
+        # route attention through torch's fused SDPA kernels (FlashAttention on
+        # supported GPUs) rather than the eager implementation
+        model = AutoModel.from_pretrained(model_name, attn_implementation='sdpa')
         return processor, model
     except OSError as e:
         if 'gated repo' in str(e).lower():
@@ -1,7 +1,63 @@
 """Loads pre-computed model outputs from disk."""
 
-from filterworld.filters.base import Filter
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from filterworld.filters.base import FeatureOutput, Filter
+
+logger = logging.getLogger(__name__)
 
 
 class FileFilter(Filter):
-    pass
+    """Replays pre-computed features instead of running a model.
+
+    Reads a `.npy` feature file written by `filterworld extract`: one
+    (N, D, H_feat, W_feat) array whose row t holds the features of frame t,
+    all channels of a frame stored contiguously. The file is memory-mapped,
+    so frames are paged in from disk as they are replayed rather than loaded
+    up front.
+
+    Args:
+        path: path to the pre-computed feature file
+
+    Raises:
+        ValueError: if the file format is not supported
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        if self.path.suffix != '.npy':
+            raise ValueError(
+                f'unsupported pre-computed output format: {self.path.suffix!r}. '
+                'run `filterworld extract` to write a .npy feature file.'
+            )
+        self._features = np.load(self.path, mmap_mode='r')  # (N, D, H, W)
+        self._frame_idx = 0
+        logger.info(
+            'replaying %d frames of %s features from %s',
+            self._features.shape[0], 'x'.join(map(str, self._features.shape[1:])), self.path,
+        )
+
+    def process_frame(self, frame: np.ndarray) -> FeatureOutput:
+        """Look up the stored features for the next frame.
+
+        Args:
+            frame: numpy array of shape (H, W, 3) in RGB order, dtype uint8 (unused)
+
+        Returns:
+            FeatureOutput with float32 features of shape (D, H_feat, W_feat)
+
+        Raises:
+            ValueError: if the video has more frames than the feature file
+        """
+        idx = self._frame_idx
+        if idx >= self._features.shape[0]:
+            raise ValueError(
+                f'feature file {self.path} has {self._features.shape[0]} frames, '
+                f'but frame {idx} was requested'
+            )
+        self._frame_idx += 1
+        features = np.asarray(self._features[idx], dtype=np.float32)
+        return FeatureOutput(frame_idx=idx, features=features)
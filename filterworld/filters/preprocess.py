@@ -0,0 +1,117 @@
+"""Model input preprocessing on the model device."""
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from filterworld.filters.upload import PinnedUploader
+
+# PIL resampling codes used by Hugging Face image processors -> interpolate modes
+_RESAMPLE_MODES = {
+    2: 'bilinear',
+    3: 'bicubic',
+}
+
+
+class DevicePreprocessor:
+    """Applies a Hugging Face image processor's transforms on the model device.
+
+    Frames are uploaded as uint8, a quarter of the bytes of a float copy,
+    then resized, center-cropped, rescaled and normalized as one batch on
+    the device, so the CPU never touches a float image. Follows the
+    processor's configuration: resize to a fixed size or by shortest edge
+    with antialiased bilinear or bicubic resampling, and an optional center
+    crop. On natural images the result is within one uint8 step of the
+    processor's output.
+
+    Args:
+        processor: Hugging Face image processor supplying the configuration
+        device: model device
+        dtype: dtype of the returned model input
+        rescale_first: whether the processor rescales before resizing, as
+            DINOv3's does; most processors resize the uint8 image, so the
+            resized values are rounded and clamped to [0, 255]
+
+    Raises:
+        ValueError: if the processor uses an unsupported resize or resampling
+    """
+
+    def __init__(
+        self,
+        processor,
+        device: torch.device,
+        dtype: torch.dtype = torch.float32,
+        rescale_first: bool = False,
+    ) -> None:
+        self._uploader = PinnedUploader(device)
+        self._dtype = dtype
+        self._quantize_resized = not rescale_first
+
+        size = processor.size
+        self._size: tuple[int, int] | None = None
+        self._shortest_edge: int | None = None
+        if size.get('height') is not None and size.get('width') is not None:
+            self._size = (size['height'], size['width'])
+        elif size.get('shortest_edge') is not None:
+            self._shortest_edge = size['shortest_edge']
+        else:
+            raise ValueError(f'unsupported processor resize: {dict(size)}')
+
+        resample = int(processor.resample)
+        if resample not in _RESAMPLE_MODES:
+            raise ValueError(f'unsupported processor resampling: {processor.resample}')
+        self._mode = _RESAMPLE_MODES[resample]
+
+        self._crop_size: tuple[int, int] | None = None
+        if getattr(processor, 'do_center_crop', False):
+            crop_size = processor.crop_size
+            self._crop_size = (crop_size['height'], crop_size['width'])
+
+        # fold the rescale into the normalization: x * scale - shift
+        scale = processor.rescale_factor if processor.do_rescale else 1.0
+        mean = torch.tensor(processor.image_mean).view(1, 3, 1, 1)
+        std = torch.tensor(processor.image_std).view(1, 3, 1, 1)
+        if not processor.do_normalize:
+            mean, std = torch.zeros_like(mean), torch.ones_like(std)
+        self._scale = (scale / std).to(device)
+        self._shift = (mean / std).to(device)
+
+    def __call__(self, frames: list[np.ndarray]) -> torch.Tensor:
+        """Preprocess a batch of frames.
+
+        Args:
+            frames: list of numpy arrays of shape (H, W, 3) in RGB order, dtype uint8
+
+        Returns:
+            model input of shape (B, 3, H_in, W_in)
+        """
+        x = self._uploader.upload(frames).permute(0, 3, 1, 2).float()  # (B, 3, H, W)
+        x = F.interpolate(
+            x, size=self._resize_shape(*x.shape[2:]), mode=self._mode,
+            align_corners=False, antialias=True,
+        )
+        if self._quantize_resized:
+            x = x.round_().clamp_(0.0, 255.0)
+        if self._crop_size is not None:
+            crop_h, crop_w = self._crop_size
+            top = (x.shape[2] - crop_h) // 2
+            left = (x.shape[3] - crop_w) // 2
+            x = x[:, :, top:top + crop_h, left:left + crop_w]
+        return (x * self._scale - self._shift).to(self._dtype)
+
+    def _resize_shape(self, height: int, width: int) -> tuple[int, int]:
+        """Output size of the resize step for a given frame size.
+
+        Args:
+            height: frame height in pixels
+            width: frame width in pixels
+
+        Returns:
+            resized (height, width)
+        """
+        if self._size is not None:
+            return self._size
+        # scale the shorter side to the target, keeping the aspect ratio
+        short, long = min(height, width), max(height, width)
+        new_short, new_long = self._shortest_edge, int(self._shortest_edge * long / short)
+        return (new_short, new_long) if height <= width else (new_long, new_short)
@@ -0,0 +1,63 @@
+"""Host-to-device uploads for model inputs."""
+
+import numpy as np
+import torch
+
+
+class PinnedUploader:
+    """Stacks host arrays into a batch and copies it to the model device.
+
+    On CUDA, arrays are stacked straight into a reused pinned staging buffer
+    and copied asynchronously on a dedicated stream, so the upload of one
+    batch overlaps with compute already queued on the current stream. Two
+    staging buffers alternate between calls, so one can be filled while the
+    previous upload may still be in flight. On other devices the stacked
+    array is wrapped without a copy.
+
+    Args:
+        device: device the batches are copied to
+    """
+
+    def __init__(self, device: torch.device) -> None:
+        self.device = device
+        self._stream = torch.cuda.Stream(device) if device.type == 'cuda' else None
+        self._staging: list[tuple[torch.Tensor, torch.cuda.Event] | None] = [None, None]
+        self._staging_idx = 0
+
+    def upload(self, arrays: list[np.ndarray]) -> torch.Tensor:
+        """Stack arrays along a new first axis and copy them to the device.
+
+        Args:
+            arrays: arrays of identical shape and dtype
+
+        Returns:
+            tensor of shape (B, *array_shape) on the device, safe to use on
+            the current stream
+        """
+        if self._stream is None:
+            return torch.from_numpy(np.stack(arrays))
+
+        shape = (len(arrays), *arrays[0].shape)
+        dtype = torch.from_numpy(np.empty(0, dtype=arrays[0].dtype)).dtype
+        self._staging_idx = 1 - self._staging_idx
+        slot = self._staging[self._staging_idx]
+        if slot is None or slot[0].shape != shape or slot[0].dtype != dtype:
+            staging = torch.empty(shape, dtype=dtype, pin_memory=True)
+        else:
+            staging, copied = slot
+            # the upload that last read this buffer must finish first
+            copied.synchronize()
+
+        np.stack(arrays, out=staging.numpy())
+        compute_stream = torch.cuda.current_stream(self.device)
+        with torch.cuda.stream(self._stream):
+            batch = staging.to(self.device, non_blocking=True)
+            copied = torch.cuda.Event()
+            copied.record(self._stream)
+        self._staging[self._staging_idx] = (staging, copied)
+
+        # compute waits for the copy; the allocator must not reuse the batch's
+        # memory until compute is done with it
+        compute_stream.wait_stream(self._stream)
+        batch.record_stream(compute_stream)
+        return batch
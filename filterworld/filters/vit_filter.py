@@ -0,0 +1,184 @@
+"""Shared base for filters that extract patch features from a ViT."""
+
+import logging
+from abc import abstractmethod
+from typing import ClassVar
+
+import numpy as np
+import torch
+
+from filterworld.filters.base import FeatureOutput, Filter
+from filterworld.filters.preprocess import DevicePreprocessor
+
+logger = logging.getLogger(__name__)
+
+# loaded (processor, model) pairs keyed by (filter class, model_name, resolution),
+# so filters built repeatedly in one process share weights instead of reloading them
+_MODEL_CACHE: dict[tuple[type, str, int | None], tuple] = {}
+
+
+class ViTFilter(Filter):
+    """Base class for filters that extract spatial patch features from a ViT.
+
+    Subclasses supply the model loader and any extra forward arguments; the
+    batched forward pass is shared. Frames are preprocessed on the model
+    device, the model runs in bfloat16 on the GPU, and the CLS and register
+    tokens are dropped before the patch tokens are reshaped to a grid.
+
+    Args:
+        model_name: Hugging Face model identifier
+        resolution: input image resolution in pixels; must be divisible by patch_size.
+            None uses the model default (typically 224).
+        batch_size: number of frames to run through the model per forward pass
+        compile: on CUDA, compile the forward pass with torch.compile; compilation
+            runs during construction, at `batch_size`, rather than on the first frame
+
+    Raises:
+        ValueError: if batch_size is less than 1
+    """
+
+    # model family shown in log messages
+    _family: ClassVar[str] = 'ViT'
+    # extra keyword arguments for the model's forward pass
+    _forward_kwargs: ClassVar[dict] = {}
+    # whether the processor rescales before resizing; see DevicePreprocessor
+    _rescale_first: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        model_name: str,
+        resolution: int | None = None,
+        batch_size: int = 8,
+        compile: bool = True,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+        self.model_name = model_name
+        self.resolution = resolution
+        self.batch_size = batch_size
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        logger.info('loading %s model %s on %s', self._family, model_name, self.device)
+
+        processor_kwargs = {}
+        if resolution is not None:
+            processor_kwargs['size'] = {'height': resolution, 'width': resolution}
+            processor_kwargs['crop_size'] = {'height': resolution, 'width': resolution}
+
+        cache_key = (type(self), model_name, resolution)
+        if cache_key not in _MODEL_CACHE:
+            _MODEL_CACHE[cache_key] = self._load_model(model_name, processor_kwargs)
+        self.processor, self.model = _MODEL_CACHE[cache_key]
+        self.model.eval()
+        # on gpu, run in bfloat16: half the activation bytes and tensor-core matmuls
+        self._dtype = torch.bfloat16 if self.device.type == 'cuda' else torch.float32
+        self.model.to(self.device, dtype=self._dtype)
+
+        self._num_prefix = 1 + getattr(self.model.config, 'num_register_tokens', 0)
+        self._patch_size = self.model.config.patch_size
+        self._frame_idx = 0
+        # the processor only supplies the preprocessing config; frames are
+        # resized and normalized on the model device
+        self._preprocess = DevicePreprocessor(
+            self.processor, self.device, self._dtype, rescale_first=self._rescale_first,
+        )
+
+        self._compiled = compile and self.device.type == 'cuda'
+        if self._compiled:
+            self._compile_model()
+            self._warmup()
+
+    @abstractmethod
+    def _load_model(self, model_name: str, processor_kwargs: dict) -> tuple:
+        """Load the processor and model.
+
+        Args:
+            model_name: Hugging Face model identifier
+            processor_kwargs: extra kwargs for the processor's from_pretrained
+
+        Returns:
+            tuple of (processor, model)
+        """
+        ...
+
+    def _compile_model(self) -> None:
+        """Compile the forward pass.
+
+        reduce-overhead replays it as a CUDA graph, removing per-layer Python
+        and kernel-launch overhead.
+        """
+        self.model = torch.compile(self.model, mode='reduce-overhead')
+
+    def process_frame(self, frame: np.ndarray) -> FeatureOutput:
+        """Extract spatial features from a single video frame.
+
+        Args:
+            frame: numpy array of shape (H, W, 3) in RGB order, dtype uint8
+
+        Returns:
+            FeatureOutput with features of shape (D, H_feat, W_feat), left on the
+            model device if `keep_on_device` is set
+        """
+        return self.process_batch([frame])[0]
+
+    @torch.inference_mode()
+    def process_batch(self, frames: list[np.ndarray]) -> list[FeatureOutput]:
+        """Extract spatial features from consecutive frames in one forward pass.
+
+        Args:
+            frames: list of numpy arrays of shape (H, W, 3) in RGB order, dtype uint8
+
+        Returns:
+            one FeatureOutput per frame, in order, with features of shape
+            (D, H_feat, W_feat)
+        """
+        pixel_values = self._preprocess(frames)  # (B, 3, H, W)
+        b = pixel_values.shape[0]
+        if self._compiled:
+            if b < self.batch_size:
+                # pad short batches to the compiled shape rather than recompiling
+                pad = pixel_values[-1:].expand(self.batch_size - b, -1, -1, -1)
+                pixel_values = torch.cat([pixel_values, pad])
+            # mark each call as a new CUDA graph replay so its static buffers
+            # can be reused
+            torch.compiler.cudagraph_mark_step_begin()
+
+        outputs = self.model(
+            pixel_values, **self._forward_kwargs,
+        ).last_hidden_state  # (B, S + num_prefix, D)
+
+        # drop padding, skip CLS + register tokens on the device
+        hidden = outputs[:b, self._num_prefix:, :]  # (B, S, D)
+
+        # reshape to spatial grid
+        h_feat = pixel_values.shape[2] // self._patch_size
+        w_feat = pixel_values.shape[3] // self._patch_size
+
+        # transpose into a fresh contiguous (B, D, S) block: the host copy is
+        # then a single dense transfer, and the result no longer aliases the
+        # CUDA graph's output buffer, which the next replay overwrites
+        hidden = hidden.transpose(1, 2)
+        if self.keep_on_device:
+            features = hidden.contiguous()
+        else:
+            # numpy has no bfloat16; cast during the same copy, which copy=True
+            # forces even when the model already runs in float32
+            features = hidden.to(
+                torch.float32, memory_format=torch.contiguous_format, copy=True,
+            )
+        features = features.view(b, -1, h_feat, w_feat)  # (B, D, H, W)
+        if not self.keep_on_device:
+            features = features.cpu().numpy()
+
+        results = []
+        for sample in features:
+            results.append(FeatureOutput(frame_idx=self._frame_idx, features=sample))
+            self._frame_idx += 1
+
+        return results
+
+    def _warmup(self) -> None:
+        """Run one full batch through the compiled model to trigger compilation."""
+        logger.info('compiling %s forward pass', self.model_name)
+        frame = np.zeros((224, 224, 3), dtype=np.uint8)
+        self.process_batch([frame] * self.batch_size)
+        self._frame_idx = 0
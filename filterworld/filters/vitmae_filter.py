@@ -1,73 +1,42 @@
 """ViT-MAE feature extraction filter."""
 
-import logging
-import math
-
-import numpy as np
-import torch
 from transformers import ViTImageProcessor, ViTModel
 
-from filterworld.filters.base import FeatureOutput, Filter
-
-logger = logging.getLogger(__name__)
+from filterworld.filters.vit_filter import ViTFilter
 
 
-class ViTMAEFilter(Filter):
+class ViTMAEFilter(ViTFilter):
     """Extracts spatial features from frames using a ViT-MAE model.
 
-    Args:
-        model_name: Hugging Face model identifier (e.g. 'facebook/vit-mae-base')
-        resolution: input image resolution in pixels; must be divisible by patch_size.
-            None uses the model default (typically 224).
+    See `ViTFilter` for the arguments; model names look like
+    'facebook/vit-mae-base'.
     """
 
-    def __init__(self, model_name: str, resolution: int | None = None) -> None:
-        self.model_name = model_name
-        self.resolution = resolution
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        logger.info('loading ViT-MAE model %s on %s', model_name, self.device)
-
-        processor_kwargs = {}
-        if resolution is not None:
-            processor_kwargs['size'] = {'height': resolution, 'width': resolution}
-            processor_kwargs['crop_size'] = {'height': resolution, 'width': resolution}
-        self.processor = ViTImageProcessor.from_pretrained(model_name, **processor_kwargs)
-        self.model = ViTModel.from_pretrained(model_name, add_pooling_layer=False)
-        self.model.eval()
-        self.model.to(self.device)
-
-        self._frame_idx = 0
+    _family = 'ViT-MAE'
+    _forward_kwargs = {'interpolate_pos_encoding': True}
 
-    def process_frame(self, frame: np.ndarray) -> FeatureOutput:
-        """Extract spatial features from a single video frame.
+    def _load_model(
+        self,
+        model_name: str,
+        processor_kwargs: dict,
+    ) -> tuple[ViTImageProcessor, ViTModel]:
+        """Load the ViT-MAE processor and model."""
+        return _load_vitmae(model_name, processor_kwargs)
 
-        Args:
-            frame: numpy array of shape (H, W, 3) in RGB order, dtype uint8
 
-        Returns:
-            FeatureOutput with features of shape (D, H_feat, W_feat)
-        """
-        inputs = self.processor(images=frame, return_tensors='pt')
-        pixel_values = inputs['pixel_values'].to(self.device)
+def _load_vitmae(
+    model_name: str,
+    processor_kwargs: dict,
+) -> tuple[ViTImageProcessor, ViTModel]:
+    """Load the ViT-MAE processor and model.
 
-        with torch.no_grad():
-            outputs = self.model(
-                pixel_values,
-                return_dict=True,
-                output_hidden_states=False,
-                output_attentions=False,
-                interpolate_pos_encoding=True,
-            ).last_hidden_state  # (1, S + 1, D)
-
-        # skip CLS token, reshape to spatial grid
-        hidden = outputs[:, 1:, :]  # (1, S, D)
-        s = hidden.shape[1]
-        h = w = int(math.isqrt(s))
-
-        features = hidden[0].reshape(h, w, -1).permute(2, 0, 1)  # (D, H, W)
-        features_np = features.cpu().numpy()
-
-        idx = self._frame_idx
-        self._frame_idx += 1
+    Args:
+        model_name: Hugging Face model identifier
+        processor_kwargs: extra kwargs for ViTImageProcessor.from_pretrained
 
-        return FeatureOutput(frame_idx=idx, features=features_np)
+    Returns:
+        tuple of (processor, model)
+    """
+    processor = ViTImageProcessor.from_pretrained(model_name, **processor_kwargs)
+    model = ViTModel.from_pretrained(model_name, add_pooling_layer=False)
+    return processor, model
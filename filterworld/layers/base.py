@@ -12,7 +12,8 @@ class Layer(ABC):
 
     A Layer takes a frame and filter output and draws one visual element
     (e.g. the raw image, bounding boxes, segmentation masks) onto a
-    target image.
+    target image. Layers draw in place: the target buffer is owned by the
+    pane and reused across frames, so rendering allocates no new images.
 
     Args:
         opacity: layer opacity in [0.0, 1.0], default 1.0
@@ -21,6 +22,23 @@ class Layer(ABC):
     def __init__(self, opacity: float = 1.0) -> None:
         self.opacity = np.clip(opacity, 0.0, 1.0)
 
+    @property
+    def opaque(self) -> bool:
+        """Whether this layer overwrites every pixel regardless of the target.
+
+        Opaque layers at the bottom of a pane's stack receive a target that
+        has not been cleared, which lets the pane skip zero-filling it.
+        """
+        return False
+
+    @property
+    def uses_filter_output(self) -> bool:
+        """Whether rendering this layer reads the filter output.
+
+        When no layer on the canvas does, the pipeline skips the model.
+        """
+        return True
+
     @abstractmethod
     def render(
         self,
@@ -28,14 +46,15 @@ class Layer(ABC):
         frame: np.ndarray,
         filter_output: FilterOutput,
     ) -> np.ndarray:
-        """Render this layer onto the target image.
+        """Render this layer onto the target image, in place.
 
         Args:
-            target: current composited image of shape (H, W, 3), dtype uint8
+            target: current composited image of shape (H, W, 3), dtype uint8;
+                modified in place
             frame: original video frame of shape (H, W, 3), dtype uint8
             filter_output: output from the filter for this frame
 
         Returns:
-            updated target image of shape (H, W, 3), dtype uint8
+            the target image, updated in place
         """
         ...
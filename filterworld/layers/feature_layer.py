@@ -4,6 +4,7 @@ import logging
 
 import cv2
 import numpy as np
+import torch
 
 from filterworld.filters.base import FeatureOutput, FilterOutput
 from filterworld.layers.base import Layer
@@ -15,7 +16,9 @@ class FeatureLayer(Layer):
     """Layer that visualizes spatial feature maps from a model.
 
     Reduces a high-dimensional feature tensor to a 3-channel image
-    for display.
+    for display. Features that arrive as torch tensors (e.g. still on the
+    GPU) are reduced on their device, so only the small 3-channel image is
+    copied to the host.
 
     Args:
         method: reduction method to convert features to RGB.
@@ -36,6 +39,12 @@ class FeatureLayer(Layer):
         self.pca_path = pca_path
         self._pca_components: np.ndarray | None = None
         self._pca_mean: np.ndarray | None = None
+        self._pca_bias: np.ndarray | None = None
+        # PCA weights as tensors on the device of the incoming features
+        self._pca_components_torch: torch.Tensor | None = None
+        self._pca_bias_torch: torch.Tensor | None = None
+        # upsampled visualization for blending, reused across frames
+        self._vis_resized: np.ndarray | None = None
 
         if method == 'pca' and pca_path is None:
             raise ValueError(
@@ -43,15 +52,22 @@ class FeatureLayer(Layer):
                 'run `filterworld precompute` first to generate PCA weights.'
             )
 
+    @property
+    def uses_filter_output(self) -> bool:
+        """Whether rendering this layer reads the filter output."""
+        # fully transparent layers are skipped without looking at the features
+        return self.opacity > 0.0
+
     def render(
         self,
         target: np.ndarray,
         frame: np.ndarray,
         filter_output: FilterOutput,
     ) -> np.ndarray:
-        """Render feature map visualization onto the target image.
+        """Render feature map visualization onto the target image, in place.
 
-        If filter_output is not a FeatureOutput, returns target unchanged.
+        If filter_output is not a FeatureOutput, or the layer is fully
+        transparent, returns target unchanged.
 
         Args:
             target: current composited image of shape (H, W, 3), dtype uint8
@@ -59,34 +75,43 @@ class FeatureLayer(Layer):
             filter_output: output from the filter for this frame
 
         Returns:
-            updated target image of shape (H, W, 3), dtype uint8
+            the target with the feature visualization drawn in
         """
-        if not isinstance(filter_output, FeatureOutput):
+        if not isinstance(filter_output, FeatureOutput) or self.opacity <= 0.0:
             return target
 
         features = filter_output.features  # (D, H_feat, W_feat)
         vis = self._reduce(features)  # (H_feat, W_feat, 3), uint8
 
-        h, w = frame.shape[:2]
-        vis_resized = cv2.resize(vis, (w, h), interpolation=cv2.INTER_NEAREST)  # cv2.INTER_LINEAR)
-
+        h, w = target.shape[:2]
         if self.opacity >= 1.0:
-            return vis_resized
-        blended = (
-            target.astype(np.float32) * (1.0 - self.opacity)
-            + vis_resized.astype(np.float32) * self.opacity
+            # upsample straight into the target
+            cv2.resize(vis, (w, h), dst=target, interpolation=cv2.INTER_NEAREST)
+            return target
+
+        if self._vis_resized is None or self._vis_resized.shape != target.shape:
+            self._vis_resized = np.empty_like(target)
+        cv2.resize(vis, (w, h), dst=self._vis_resized, interpolation=cv2.INTER_NEAREST)
+        # single-pass uint8 blend, rounded to nearest
+        cv2.addWeighted(
+            target, 1.0 - self.opacity, self._vis_resized, self.opacity, 0.0, dst=target,
         )
-        return blended.astype(np.uint8)
+        return target
 
-    def _reduce(self, features: np.ndarray) -> np.ndarray:
+    def _reduce(self, features: np.ndarray | torch.Tensor) -> np.ndarray:
         """Reduce feature tensor to a 3-channel uint8 image.
 
         Args:
-            features: feature tensor of shape (D, H, W)
+            features: feature tensor of shape (D, H, W), numpy or torch
 
         Returns:
             RGB image of shape (H, W, 3), dtype uint8
         """
+        if isinstance(features, torch.Tensor):
+            if self.method == 'first3':
+                return self._reduce_first3_torch(features)
+            if self.method == 'pca':
+                return self._reduce_pca_torch(features)
         if self.method == 'first3':
             return self._reduce_first3(features)
         if self.method == 'pca':
@@ -102,18 +127,37 @@ class FeatureLayer(Layer):
         Returns:
             RGB image of shape (H, W, 3), dtype uint8
         """
-        channels = features[:3]  # (3, H, W)
-        result = np.zeros((*channels.shape[1:], 3), dtype=np.uint8)
-        for idx_ch in range(3):
-            ch = channels[idx_ch]
-            ch_min = ch.min()
-            ch_max = ch.max()
-            if ch_max - ch_min > 0:
-                normalized = (ch - ch_min) / (ch_max - ch_min) * 255.0
-            else:
-                normalized = np.zeros_like(ch)
-            result[:, :, idx_ch] = normalized.astype(np.uint8)
-        return result
+        _, h, w = features.shape
+        channels = features[:3].reshape(3, h * w)
+        ch_min = channels.min(axis=1, keepdims=True)  # (3, 1)
+        ch_range = channels.max(axis=1, keepdims=True) - ch_min
+        # divide before scaling so each channel's max lands exactly on 255;
+        # constant channels are all zeros after the shift and stay 0
+        normalized = channels - ch_min  # (3, H*W)
+        np.divide(normalized, ch_range, out=normalized, where=ch_range > 0)
+        normalized *= 255.0
+        # the uint8 cast writes the transposed (H*W, 3) layout directly
+        return normalized.T.astype(np.uint8, order='C').reshape(h, w, 3)
+
+    def _reduce_first3_torch(self, features: torch.Tensor) -> np.ndarray:
+        """Take the first 3 channels and normalize each to 0-255 on-device.
+
+        Args:
+            features: feature tensor of shape (D, H, W) where D >= 3
+
+        Returns:
+            RGB image of shape (H, W, 3), dtype uint8, on the host
+        """
+        channels = features[:3].float()  # (3, H, W)
+        ch_min, ch_max = torch.aminmax(channels.reshape(3, -1), dim=1)
+        ch_min = ch_min.view(3, 1, 1)
+        ch_max = ch_max.view(3, 1, 1)
+        # divide before scaling, as in the numpy path; constant channels are
+        # all zeros after the shift and stay 0
+        ch_range = ch_max - ch_min
+        ch_range = torch.where(ch_range > 0, ch_range, torch.ones_like(ch_range))
+        normalized = (channels - ch_min) / ch_range * 255.0
+        return normalized.to(torch.uint8).permute(1, 2, 0).contiguous().cpu().numpy()
 
     def _reduce_pca(self, features: np.ndarray) -> np.ndarray:
         """Project features using precomputed PCA weights.
@@ -126,23 +170,75 @@ class FeatureLayer(Layer):
         Returns:
             RGB image of shape (H, W, 3), dtype uint8
         """
-        if self._pca_components is None:
-            logger.info('loading PCA weights from %s', self.pca_path)
-            data = np.load(self.pca_path)
-            self._pca_components = data['components']  # (3, D)
-            self._pca_mean = data['mean']  # (D,)
+        self._load_pca()
 
         d, h, w = features.shape
-        patches = features.reshape(d, h * w).T  # (H*W, D)
-        centered = patches - self._pca_mean  # (H*W, D)
-        projected = centered @ self._pca_components.T  # (H*W, 3)
+        # single GEMM on the (D, H*W) view with the mean folded into a bias,
+        # C (x - m) = C x - C m, so no centered (D, H*W) copy is made
+        projected = self._pca_components @ features.reshape(d, h * w)  # (3, H*W)
+        projected -= self._pca_bias
 
-        # normalize to 0-255 using global min/max across all channels
+        # normalize to 0-255 in place using global min/max across all channels,
+        # dividing before scaling so the max lands exactly on 255
         val_min = projected.min()
-        val_max = projected.max()
-        if val_max - val_min > 0:
-            normalized = (projected - val_min) / (val_max - val_min) * 255.0
+        val_range = projected.max() - val_min
+        if val_range > 0:
+            projected -= val_min
+            projected /= val_range
+            projected *= 255.0
         else:
-            normalized = np.zeros_like(projected)
+            projected[:] = 0
+
+        # the uint8 cast writes the transposed (H*W, 3) layout directly
+        return projected.T.astype(np.uint8, order='C').reshape(h, w, 3)
 
-        return normalized.astype(np.uint8).reshape(h, w, 3)
+    def _reduce_pca_torch(self, features: torch.Tensor) -> np.ndarray:
+        """Project features using precomputed PCA weights on-device.
+
+        The projection, normalization and uint8 quantization all run on the
+        features' device, so only the (H, W, 3) uint8 image is copied back.
+        The projection runs in float32 whatever the features' dtype: with
+        the mean folded into a bias, a bfloat16 product would cancel
+        catastrophically against it whenever the features share a large
+        common offset.
+
+        Args:
+            features: feature tensor of shape (D, H, W)
+
+        Returns:
+            RGB image of shape (H, W, 3), dtype uint8, on the host
+        """
+        self._load_pca()
+        if (
+            self._pca_components_torch is None
+            or self._pca_components_torch.device != features.device
+        ):
+            self._pca_components_torch = torch.from_numpy(self._pca_components).to(
+                features.device,
+            )
+            self._pca_bias_torch = torch.from_numpy(self._pca_bias).to(features.device)
+
+        d, h, w = features.shape
+        # single float32 GEMM with the mean folded into a bias, as in the numpy path
+        projected = self._pca_components_torch @ features.reshape(d, h * w).float()
+        projected -= self._pca_bias_torch  # (3, H*W)
+
+        # normalize to 0-255 using global min/max across all channels, dividing
+        # before scaling as in the numpy path; a constant projection maps to 0
+        val_min = projected.min()
+        val_range = projected.max() - val_min
+        val_range = torch.where(val_range > 0, val_range, torch.ones_like(val_range))
+        normalized = (projected - val_min) / val_range * 255.0
+
+        return normalized.to(torch.uint8).T.contiguous().view(h, w, 3).cpu().numpy()
+
+    def _load_pca(self) -> None:
+        """Load the PCA weights from disk on first use and cache them."""
+        if self._pca_components is not None:
+            return
+        logger.info('loading PCA weights from %s', self.pca_path)
+        data = np.load(self.pca_path)
+        # float32 keeps the projection from upcasting the features
+        self._pca_components = data['components'].astype(np.float32)  # (3, D)
+        self._pca_mean = data['mean'].astype(np.float32)  # (D,)
+        self._pca_bias = (self._pca_components @ self._pca_mean)[:, None]  # (3, 1)
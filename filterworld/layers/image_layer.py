@@ -1,5 +1,6 @@
 """Renders a raw image/frame."""
 
+import cv2
 import numpy as np
 
 from filterworld.filters.base import FilterOutput
@@ -13,13 +14,23 @@ class ImageLayer(Layer):
     providing the base image that other layers draw on top of.
     """
 
+    @property
+    def opaque(self) -> bool:
+        """Whether this layer overwrites every pixel regardless of the target."""
+        return self.opacity >= 1.0
+
+    @property
+    def uses_filter_output(self) -> bool:
+        """Whether rendering this layer reads the filter output."""
+        return False
+
     def render(
         self,
         target: np.ndarray,
         frame: np.ndarray,
         filter_output: FilterOutput,
     ) -> np.ndarray:
-        """Copy the original frame onto the target.
+        """Copy the original frame onto the target, in place.
 
         Args:
             target: current composited image of shape (H, W, 3), dtype uint8
@@ -27,12 +38,13 @@ class ImageLayer(Layer):
             filter_output: output from the filter (unused)
 
         Returns:
-            the frame blended onto target according to opacity
+            the target with the frame blended in according to opacity
         """
         if self.opacity >= 1.0:
-            return frame.copy()
-        blended = (
-            target.astype(np.float32) * (1.0 - self.opacity)
-            + frame.astype(np.float32) * self.opacity
-        )
-        return blended.astype(np.uint8)
+            np.copyto(target, frame)
+            return target
+        if self.opacity <= 0.0:
+            return target
+        # single-pass uint8 blend, rounded to nearest
+        cv2.addWeighted(target, 1.0 - self.opacity, frame, self.opacity, 0.0, dst=target)
+        return target
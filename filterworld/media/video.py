@@ -9,6 +9,10 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# frames this far ahead of the current position are reached by decoding
+# forward; further jumps seek, which decodes from the nearest keyframe
+_MAX_FORWARD_DECODE = 32
+
 
 class VideoReader:
     """Reads frames from a video file.
@@ -16,21 +20,37 @@ class VideoReader:
     Wraps OpenCV's VideoCapture to provide an iterable interface over
     video frames as numpy arrays (H, W, C) in RGB order.
 
+    Iteration is a single forward pass from the capture's current position,
+    with no seek. Call `rewind` before iterating the same reader again.
+    Individual frames can be read by index with `read_frame`.
+
+    Decoding uses any hardware decoder OpenCV's backend exposes (e.g. NVDEC,
+    VA-API, D3D11) and falls back to the CPU decoder when there is none.
+
     Args:
         video_path: path to the input video file
+        hw_accel: whether to request hardware-accelerated decoding
 
     Raises:
         FileNotFoundError: if video_path does not exist
         RuntimeError: if the video file cannot be opened
     """
 
-    def __init__(self, video_path: str) -> None:
+    def __init__(self, video_path: str, hw_accel: bool = True) -> None:
         path = Path(video_path)
         if not path.exists():
             raise FileNotFoundError(f'video not found: {video_path}')
 
         self._path = path
-        self._cap = cv2.VideoCapture(str(path))
+        self._cap = None
+        if hw_accel:
+            self._cap = cv2.VideoCapture(
+                str(path), cv2.CAP_ANY,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+        if self._cap is None or not self._cap.isOpened():
+            # some backends refuse the hardware params outright
+            self._cap = cv2.VideoCapture(str(path))
         if not self._cap.isOpened():
             raise RuntimeError(f'failed to open video: {video_path}')
 
@@ -38,10 +58,16 @@ class VideoReader:
         self._frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
         self._width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self._height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._consumed = False
+
+        hw_decode = (
+            int(self._cap.get(cv2.CAP_PROP_HW_ACCELERATION)) != cv2.VIDEO_ACCELERATION_NONE
+        )
 
         logger.info(
-            'opened video %s: %dx%d, %.2f fps, %d frames',
+            'opened video %s: %dx%d, %.2f fps, %d frames, %s decode',
             path.name, self._width, self._height, self._fps, self._frame_count,
+            'hardware' if hw_decode else 'software',
         )
 
     @property
@@ -64,13 +90,77 @@ class VideoReader:
         """Frame height in pixels."""
         return self._height
 
+    def rewind(self) -> None:
+        """Seek back to the first frame so the video can be iterated again.
+
+        Raises:
+            RuntimeError: if the reader is closed
+        """
+        if self._cap is None:
+            raise RuntimeError(f'video reader is closed: {self._path.name}')
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._consumed = False
+
+    def read_frame(self, idx: int) -> np.ndarray:
+        """Decode the frame at a given index.
+
+        Reading indices in increasing order is cheapest: short gaps are
+        decoded through without color conversion, and only longer jumps seek.
+        Moves the capture position, so `rewind` before iterating afterwards.
+
+        Args:
+            idx: zero-based frame index
+
+        Returns:
+            numpy array of shape (H, W, 3) in RGB order, dtype uint8
+
+        Raises:
+            RuntimeError: if the reader is closed
+            IndexError: if the frame cannot be read
+        """
+        if self._cap is None:
+            raise RuntimeError(f'video reader is closed: {self._path.name}')
+        self._consumed = True
+
+        pos = int(self._cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if 0 <= idx - pos <= _MAX_FORWARD_DECODE:
+            for _ in range(idx - pos):
+                self._cap.grab()
+        else:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+
+        ret, frame = self._cap.read()
+        if not ret:
+            raise IndexError(f'cannot read frame {idx} of {self._path.name}')
+        # opencv reads BGR; convert to RGB
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
     def __iter__(self) -> Iterator[np.ndarray]:
         """Iterate over video frames.
 
+        Returns:
+            iterator yielding numpy arrays of shape (H, W, 3) in RGB order,
+            dtype uint8
+
+        Raises:
+            RuntimeError: if the reader is closed, or the video was already
+                iterated and not rewound
+        """
+        if self._cap is None:
+            raise RuntimeError(f'video reader is closed: {self._path.name}')
+        if self._consumed:
+            raise RuntimeError(
+                f'video already iterated: {self._path.name}. call rewind() to read it again.'
+            )
+        self._consumed = True
+        return self._read_frames()
+
+    def _read_frames(self) -> Iterator[np.ndarray]:
+        """Decode frames sequentially from the current capture position.
+
         Yields:
             numpy array of shape (H, W, 3) in RGB order, dtype uint8
         """
-        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
         while True:
             ret, frame = self._cap.read()
             if not ret:
@@ -82,7 +172,16 @@ class VideoReader:
         """Return the total number of frames."""
         return self._frame_count
 
-    def __del__(self) -> None:
-        """Release the video capture resource."""
-        if hasattr(self, '_cap') and self._cap is not None:
+    def close(self) -> None:
+        """Release the video capture; safe to call more than once."""
+        if self._cap is not None:
             self._cap.release()
+            self._cap = None
+
+    def __enter__(self) -> 'VideoReader':
+        """Support use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release the capture on context manager exit."""
+        self.close()
@@ -1,13 +1,17 @@
 """Orchestrates the full processing pipeline."""
 
 import logging
+import queue
+import threading
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+import numpy as np
 from tqdm import tqdm
 
 from filterworld.canvas.canvas import Canvas
 from filterworld.config import load_config
-from filterworld.filters.base import Filter
+from filterworld.filters.base import Filter, FilterOutput
 from filterworld.filters.dinov1_filter import DINOv1Filter
 from filterworld.filters.dinov2_filter import DINOv2Filter
 from filterworld.filters.dinov3_filter import DINOv3Filter
@@ -15,12 +19,21 @@ from filterworld.filters.file_filter import FileFilter
 from filterworld.filters.vitmae_filter import ViTMAEFilter
 from filterworld.filters.identity_filter import IdentityFilter
 from filterworld.media.video import VideoReader
+from filterworld.writers.base import Writer
+from filterworld.writers.ffmpeg_writer import FFmpegWriter
+from filterworld.writers.threaded_writer import ThreadedWriter
 from filterworld.writers.video_writer import VideoWriter
 
 logger = logging.getLogger(__name__)
 
 # file extensions that indicate pre-computed filter output
-_FILE_FILTER_EXTENSIONS = {'.json', '.jsonl', '.pkl', '.pickle', '.npz', '.pt', '.csv'}
+_FILE_FILTER_EXTENSIONS = {'.json', '.jsonl', '.pkl', '.pickle', '.npy', '.npz', '.pt', '.csv'}
+
+# number of decoded frames the reader thread may run ahead of the filter
+_PREFETCH_DEPTH = 8
+
+# number of filtered batches that may wait for the render thread
+_RENDER_DEPTH = 1
 
 # standardized model name -> (huggingface identifier, filter class)
 _MODEL_REGISTRY: dict[str, tuple[str, type[Filter]]] = {
@@ -47,7 +60,11 @@ def _is_file_filter_path(model_path: str) -> bool:
     return p.suffix in _FILE_FILTER_EXTENSIONS and p.exists()
 
 
-def build_filter(model_path: str, resolution: int | None = None) -> Filter:
+def build_filter(
+    model_path: str,
+    resolution: int | None = None,
+    batch_size: int | None = None,
+) -> Filter:
     """Dispatch to the appropriate Filter based on model_path.
 
     Accepts standardized model names (e.g. 'dinov1-small', 'dinov2-base')
@@ -56,6 +73,9 @@ def build_filter(model_path: str, resolution: int | None = None) -> Filter:
     Args:
         model_path: model name, identifier, or pre-computed output file
         resolution: optional input resolution override passed to the filter
+        batch_size: optional number of frames per forward pass passed to
+            model-backed filters, which compile and warm up at this size;
+            None uses the filter's default
 
     Returns:
         an initialized Filter instance
@@ -72,7 +92,8 @@ def build_filter(model_path: str, resolution: int | None = None) -> Filter:
     if model_path in _MODEL_REGISTRY:
         hf_name, filter_cls = _MODEL_REGISTRY[model_path]
         logger.info('using model %s (%s)', model_path, hf_name)
-        return filter_cls(hf_name, resolution=resolution)
+        kwargs = {} if batch_size is None else {'batch_size': batch_size}
+        return filter_cls(hf_name, resolution=resolution, **kwargs)
     model_names = ', '.join(sorted(_MODEL_REGISTRY.keys()))
     raise ValueError(
         f'unsupported model: {model_path!r}. '
@@ -80,6 +101,150 @@ def build_filter(model_path: str, resolution: int | None = None) -> Filter:
     )
 
 
+def _build_writer(output_path: str, fps: float, codec: str) -> Writer:
+    """Choose the writer for a codec.
+
+    Four-character codes (e.g. 'mp4v', 'avc1') are OpenCV fourccs; anything
+    else is an ffmpeg encoder name (e.g. 'libx264', 'h264_nvenc') and frames
+    are streamed to an ffmpeg process.
+
+    Args:
+        output_path: path for the output video
+        fps: frames per second for the output video
+        codec: OpenCV fourcc or ffmpeg encoder name
+
+    Returns:
+        an unopened Writer
+    """
+    if len(codec) == 4:
+        return VideoWriter(output_path, fps=fps, fourcc=codec)
+    return FFmpegWriter(output_path, fps=fps, codec=codec)
+
+
+def _prefetch(
+    frames: Iterable[np.ndarray],
+    maxsize: int = _PREFETCH_DEPTH,
+) -> Iterator[np.ndarray]:
+    """Iterate over frames decoded ahead of time on a background thread.
+
+    Decoding overlaps with filtering and rendering on the calling thread;
+    OpenCV releases the GIL while it decodes. The queue is bounded, so at
+    most `maxsize` frames are held in memory. Errors raised while reading
+    are re-raised in the consumer.
+
+    Args:
+        frames: iterable of frames, e.g. a VideoReader
+        maxsize: maximum number of frames decoded ahead of the consumer
+
+    Yields:
+        frames in their original order
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def _put(item: object) -> bool:
+        # block until there is room, but give up if the consumer has stopped
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for frame in frames:
+                if not _put(frame):
+                    return
+        except Exception as e:
+            _put(e)
+        else:
+            _put(done)
+
+    thread = threading.Thread(target=_produce, name='filterworld-reader', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class _RenderThread:
+    """Renders filtered batches and writes them on a background thread.
+
+    Rendering and writing one batch then overlap with the filter's forward
+    pass on the next. The queue is bounded, so the filter runs at most
+    `maxsize` batches ahead of rendering.
+
+    Errors raised while rendering or writing are re-raised from the next
+    call to `submit` or `close`.
+
+    Args:
+        canvas: canvas to render each frame with its filter output
+        writer: writer that receives the rendered frames
+        maxsize: maximum number of filtered batches waiting to be rendered
+    """
+
+    def __init__(self, canvas: Canvas, writer: Writer, maxsize: int = _RENDER_DEPTH) -> None:
+        self._canvas = canvas
+        self._writer = writer
+        self._queue: queue.Queue[
+            tuple[list[np.ndarray], list[FilterOutput]] | None
+        ] = queue.Queue(maxsize=maxsize)
+        self._error: Exception | None = None
+        self._thread: threading.Thread | None = threading.Thread(
+            target=self._run, name='filterworld-render', daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Render queued batches until the end-of-stream sentinel arrives."""
+        while (item := self._queue.get()) is not None:
+            if self._error is not None:
+                # keep draining so the producer never blocks on a full queue
+                continue
+            try:
+                for frame, filter_output in zip(*item):
+                    self._writer.write_frame(self._canvas.render(frame, filter_output))
+            except Exception as e:
+                self._error = e
+
+    def _raise_error(self) -> None:
+        """Re-raise an error from the render thread, if there was one."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, frames: list[np.ndarray], filter_outputs: list[FilterOutput]) -> None:
+        """Queue a filtered batch for rendering.
+
+        Args:
+            frames: consecutive video frames in RGB order
+            filter_outputs: filter output for each frame
+        """
+        self._raise_error()
+        if self._thread is None:
+            raise RuntimeError('renderer is closed')
+        self._queue.put((frames, filter_outputs))
+
+    def close(self) -> None:
+        """Wait for queued batches to be rendered and written."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+
 class Pipeline:
     """Wires together VideoReader, Filter, Canvas, and Writer.
 
@@ -88,6 +253,12 @@ class Pipeline:
         model_path: model path/identifier or pre-computed output file
         config_path: optional path to a YAML config file
         output_path: path for the output video
+        resolution: optional model input resolution override
+        batch_size: optional number of frames per filter call, passed to
+            `build_filter`; None uses the filter's default
+
+    Raises:
+        ValueError: if batch_size is less than 1
     """
 
     def __init__(
@@ -97,31 +268,62 @@ class Pipeline:
         config_path: str | None,
         output_path: str,
         resolution: int | None = None,
+        batch_size: int | None = None,
     ) -> None:
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f'batch_size must be at least 1, got {batch_size}')
         self.video_path = video_path
         self.model_path = model_path
         self.output_path = output_path
         self.resolution = resolution
+        self.batch_size = batch_size
         self.config = load_config(config_path)
 
     def run(self) -> None:
         """Execute the pipeline: read frames, filter, render, write."""
         logger.info('starting pipeline: %s -> %s', self.video_path, self.output_path)
 
-        reader = VideoReader(self.video_path)
-        vid_filter = build_filter(self.model_path, resolution=self.resolution)
-        canvas = Canvas(self.config)
+        with VideoReader(self.video_path) as reader:
+            canvas = Canvas(self.config)
+            if canvas.requires_filter_output:
+                vid_filter = build_filter(
+                    self.model_path, resolution=self.resolution, batch_size=self.batch_size,
+                )
+            else:
+                # nothing would display the model's output, so don't run it
+                logger.info('no layer uses filter output; skipping model %s', self.model_path)
+                vid_filter = IdentityFilter()
+            # let feature outputs stay on the gpu; layers reduce them there and
+            # copy only the display image back to the host
+            vid_filter.keep_on_device = canvas.use_gpu
 
-        output_cfg = self.config.output
-        fps = output_cfg.fps or reader.fps
-        writer = VideoWriter(self.output_path, fps=fps, fourcc=output_cfg.codec)
+            output_cfg = self.config.output
+            fps = output_cfg.fps or reader.fps
+            # encode on a dedicated thread, overlapped with the next frames
+            writer = ThreadedWriter(_build_writer(self.output_path, fps, output_cfg.codec))
 
-        try:
-            for frame in tqdm(reader, total=reader.frame_count, desc='rendering'):
-                filter_output = vid_filter.process_frame(frame)
-                rendered = canvas.render(frame, filter_output)
-                writer.write_frame(rendered)
-        finally:
-            writer.close()
+            # render on its own thread, overlapped with the next forward pass
+            renderer = _RenderThread(canvas, writer)
+
+            # buffer frames so batching filters run one forward pass per batch
+            batch: list[np.ndarray] = []
+            frames = _prefetch(reader)
+            try:
+                for frame in tqdm(frames, total=reader.frame_count, desc='rendering'):
+                    batch.append(frame)
+                    if len(batch) >= vid_filter.batch_size:
+                        renderer.submit(batch, vid_filter.process_batch(batch))
+                        batch = []
+                # flush the remainder at end of stream
+                if batch:
+                    renderer.submit(batch, vid_filter.process_batch(batch))
+            finally:
+                # stops the reader thread if rendering failed part way through
+                frames.close()
+                try:
+                    renderer.close()
+                finally:
+                    writer.close()
+                    canvas.close()
 
         logger.info('pipeline complete: %s', self.output_path)
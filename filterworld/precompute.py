@@ -1,11 +1,13 @@
-"""Precompute PCA weights from video features."""
+"""Precompute PCA weights and feature files from video."""
 
 import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 
 import numpy as np
-from sklearn.decomposition import PCA
 from tqdm import tqdm
 
+from filterworld.filters.base import FeatureOutput
 from filterworld.media.video import VideoReader
 from filterworld.pipeline import build_filter
 
@@ -17,61 +19,243 @@ def precompute_pca(
     model_path: str,
     output_path: str,
     max_frames: int = 200,
+    batch_size: int = 32,
     resolution: int | None = None,
 ) -> None:
     """Fit PCA on patch embeddings from a video and save weights to disk.
 
-    Runs the specified model on a subset of video frames, collects all
-    spatial patch embeddings, fits a 3-component PCA, and saves the
-    components and mean to a .npz file.
+    Runs the specified model on a subset of video frames, accumulates the
+    mean and covariance of their spatial patch embeddings one frame at a
+    time, fits a 3-component PCA, and saves the components and mean to a
+    .npz file.
 
     Args:
         video_path: path to the input video file
         model_path: model name (e.g. 'dinov2-small')
         output_path: output .npz path for PCA weights
         max_frames: maximum number of frames to use for PCA fitting
+        batch_size: number of frames per model forward pass
         resolution: optional model input resolution override in pixels
+
+    Raises:
+        ValueError: if batch_size is less than 1, or no frames can be read
+            from the video
     """
-    reader = VideoReader(video_path)
-    vid_filter = build_filter(model_path, resolution=resolution)
-    frame_count = reader.frame_count
-
-    # determine which frame indices to process
-    if frame_count <= max_frames:
-        indices_selected = set(range(frame_count))
-    else:
-        indices_selected = set(
-            np.random.choice(frame_count, max_frames, replace=False).tolist()
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+    with VideoReader(video_path) as reader:
+        vid_filter = build_filter(model_path, resolution=resolution, batch_size=batch_size)
+        frame_count = reader.frame_count
+
+        # determine which frame indices to process, in decode order
+        if frame_count <= max_frames:
+            indices_selected = list(range(frame_count))
+        else:
+            # Generator.choice samples without permuting the full index range
+            rng = np.random.default_rng()
+            indices_selected = np.sort(
+                rng.choice(frame_count, max_frames, replace=False)
+            ).tolist()
+
+        logger.info(
+            'precomputing PCA: %d/%d frames from %s',
+            len(indices_selected), frame_count, video_path,
         )
 
-    logger.info(
-        'precomputing PCA: %d/%d frames from %s',
-        len(indices_selected), frame_count, video_path,
-    )
+        # stream patch embeddings into running moments, so memory stays at one
+        # (D, D) matrix however many frames are sampled
+        n_embeddings = 0
+        embedding_shift = None
+        embedding_sum = None
+        embedding_gram = None
+        pbar = tqdm(total=len(indices_selected), desc='extracting features')
+        frames_selected = _read_frames(reader, indices_selected)
+        for frames in _batched(frames_selected, batch_size):
+            for filter_output in vid_filter.process_batch(frames):
+                features = filter_output.features  # (D, H, W)
+                d, h, w = features.shape
+                patches = features.reshape(d, h * w)  # (D, H*W), a view of contiguous features
+                if embedding_gram is None:
+                    # take moments about the first frame's mean: centered values
+                    # keep the float32 products accurate, with no float64 copy
+                    embedding_shift = patches.mean(axis=1, dtype=np.float32, keepdims=True)
+                    embedding_sum = np.zeros(d)
+                    embedding_gram = np.zeros((d, d))
+                centered = patches - embedding_shift  # (D, H*W), float32
+                embedding_sum += centered.sum(axis=1, dtype=np.float64)
+                embedding_gram += centered @ centered.T
+                n_embeddings += h * w
+            pbar.update(len(frames))
+        pbar.close()
 
-    # collect patch embeddings from selected frames
-    embeddings = []
-    pbar = tqdm(total=len(indices_selected), desc='extracting features')
-    for idx_frame, frame in enumerate(reader):
-        if idx_frame not in indices_selected:
-            continue
-        filter_output = vid_filter.process_frame(frame)
-        features = filter_output.features  # (D, H, W)
-        d, h, w = features.shape
-        patches = features.reshape(d, h * w).T  # (H*W, D)
-        embeddings.append(patches)
-        pbar.update(1)
-    pbar.close()
-
-    all_embeddings = np.concatenate(embeddings, axis=0)  # (N_total, D)
-    logger.info('fitting PCA on %d patch embeddings of dimension %d', *all_embeddings.shape)
-
-    pca = PCA(n_components=3)
-    pca.fit(all_embeddings)
+    if n_embeddings == 0:
+        raise ValueError(f'no frames could be read from {video_path}')
+    logger.info('fitting PCA on %d patch embeddings of dimension %d', n_embeddings, d)
+    components, mean = _fit_pca(
+        embedding_sum, embedding_gram, n_embeddings, embedding_shift[:, 0], n_components=3,
+    )
 
     np.savez(
         output_path,
-        components=pca.components_,  # (3, D)
-        mean=pca.mean_,  # (D,)
+        components=components,  # (3, D)
+        mean=mean,  # (D,)
     )
     logger.info('saved PCA weights to %s', output_path)
+
+
+def precompute_features(
+    video_path: str,
+    model_path: str,
+    output_path: str,
+    batch_size: int = 32,
+    resolution: int | None = None,
+) -> None:
+    """Run a model over every frame of a video and save the features to disk.
+
+    Features are written as a single float16 (N, D, H_feat, W_feat) `.npy`
+    array, row t holding frame t, so `FileFilter` can memory-map it and
+    repeated renders (different layers, opacity or PCA weights) skip the
+    model entirely.
+
+    Args:
+        video_path: path to the input video file
+        model_path: model name (e.g. 'dinov2-small')
+        output_path: output .npy path for the features
+        batch_size: number of frames per model forward pass
+        resolution: optional model input resolution override in pixels
+
+    Raises:
+        ValueError: if output_path is not a .npy file, batch_size is less than
+            1, the model does not produce features, or no frames can be read
+    """
+    if Path(output_path).suffix != '.npy':
+        raise ValueError(f'feature output path must end in .npy: {output_path}')
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+
+    # rows are appended to a raw side file, since containers may under- or
+    # over-report their frame count; the .npy is sized from the rows written
+    output_path = Path(output_path)
+    partial_path = output_path.with_name(f'{output_path.name}.partial')
+    row_shape = None
+    n_written = 0
+    try:
+        with VideoReader(video_path) as reader, open(partial_path, 'wb') as partial:
+            vid_filter = build_filter(
+                model_path, resolution=resolution, batch_size=batch_size,
+            )
+            frame_count = reader.frame_count
+
+            logger.info('extracting features: %d frames from %s', frame_count, video_path)
+
+            with tqdm(total=frame_count or None, desc='extracting features') as pbar:
+                for frames in _batched(reader, batch_size):
+                    for filter_output in vid_filter.process_batch(frames):
+                        if not isinstance(filter_output, FeatureOutput):
+                            raise ValueError(
+                                f'model {model_path!r} does not produce features'
+                            )
+                        features = np.asarray(filter_output.features, dtype=np.float16)
+                        row_shape = row_shape or features.shape
+                        features.tofile(partial)
+                        n_written += 1
+                    pbar.update(len(frames))
+
+        if n_written == 0:
+            raise ValueError(f'no frames could be read from {video_path}')
+        if n_written != frame_count:
+            logger.warning(
+                'video has %d frames, not its reported count of %d', n_written, frame_count,
+            )
+
+        # copy the rows under an .npy header in batch-sized chunks, so memory
+        # stays bounded however long the video is
+        rows = np.memmap(partial_path, dtype=np.float16, mode='r', shape=(n_written, *row_shape))
+        features_out = np.lib.format.open_memmap(
+            output_path, mode='w+', dtype=np.float16, shape=rows.shape,
+        )
+        for start in range(0, n_written, batch_size):
+            features_out[start:start + batch_size] = rows[start:start + batch_size]
+        features_out.flush()
+        del rows, features_out
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+    logger.info('saved features for %d frames to %s', n_written, output_path)
+
+
+def _fit_pca(
+    embedding_sum: np.ndarray,
+    embedding_gram: np.ndarray,
+    n: int,
+    shift: np.ndarray,
+    n_components: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fit PCA from the first and second moments of shifted data.
+
+    Gives the same components as sklearn's PCA, including its sign
+    convention: the largest-magnitude entry of each component is positive.
+
+    Args:
+        embedding_sum: sum of the shifted samples, shape (D,)
+        embedding_gram: sum of the shifted sample outer products, shape (D, D)
+        n: number of samples
+        shift: vector subtracted from every sample, shape (D,)
+        n_components: number of principal components to keep
+
+    Returns:
+        tuple of (components, mean) with shapes (n_components, D) and (D,)
+    """
+    shifted_mean = embedding_sum / n
+    # the covariance does not depend on the shift
+    covariance = embedding_gram / n - np.outer(shifted_mean, shifted_mean)
+    # eigh returns eigenvalues in ascending order
+    _, eigenvectors = np.linalg.eigh(covariance)
+    components = eigenvectors[:, ::-1][:, :n_components].T  # (n_components, D)
+    signs = np.sign(components[np.arange(n_components), np.abs(components).argmax(axis=1)])
+    components = components * signs[:, None]
+    return components, shift + shifted_mean
+
+
+def _read_frames(reader: VideoReader, indices: list[int]) -> Iterator[np.ndarray]:
+    """Decode only the frames at the given indices.
+
+    Stops early, with a warning, if the video has fewer frames than its
+    reported count.
+
+    Args:
+        reader: open video reader
+        indices: frame indices in increasing order
+
+    Yields:
+        numpy arrays of shape (H, W, 3) in RGB order, dtype uint8
+    """
+    for idx in indices:
+        try:
+            yield reader.read_frame(idx)
+        except IndexError:
+            logger.warning(
+                'video has fewer frames than its reported count of %d; stopping at %d',
+                reader.frame_count, idx,
+            )
+            return
+
+
+def _batched(frames: Iterable[np.ndarray], batch_size: int) -> Iterator[list[np.ndarray]]:
+    """Group consecutive frames into lists of at most batch_size.
+
+    Args:
+        frames: iterable of frames
+        batch_size: maximum number of frames per batch
+
+    Yields:
+        lists of consecutive frames; the last may be shorter
+    """
+    batch = []
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
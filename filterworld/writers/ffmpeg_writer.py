@@ -0,0 +1,147 @@
+"""Streams rendered frames to an ffmpeg subprocess."""
+
+import logging
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from filterworld.writers.base import Writer
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_FPS = 30.0
+
+
+class FFmpegWriter(Writer):
+    """Writes frames by piping raw RGB bytes to an ffmpeg process.
+
+    ffmpeg reads the frames in their native RGB order, so no per-frame color
+    conversion is needed, and any encoder ffmpeg was built with can be used
+    (e.g. 'libx264', 'libx265', or 'h264_nvenc' for NVENC). The process is
+    started lazily on the first call to `write_frame`, once the frame size is
+    known.
+
+    Args:
+        output_path: path for the output video file
+        fps: frames per second for the output video
+        codec: ffmpeg video encoder name
+        ffmpeg: name or path of the ffmpeg executable
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: float = _DEFAULT_FPS,
+        codec: str = 'libx264',
+        ffmpeg: str = 'ffmpeg',
+    ) -> None:
+        self._output_path = Path(output_path)
+        self._fps = fps
+        self._codec = codec
+        self._ffmpeg = ffmpeg
+        self._proc: subprocess.Popen | None = None
+        # ffmpeg's error output; a file rather than a pipe, which nothing drains
+        # while frames stream in and which would block ffmpeg once full
+        self._stderr_file = None
+        self._frame_count = 0
+
+    def _ensure_process(self, height: int, width: int) -> None:
+        """Lazily start the ffmpeg process on first frame.
+
+        Args:
+            height: frame height in pixels
+            width: frame width in pixels
+
+        Raises:
+            RuntimeError: if the ffmpeg executable cannot be found
+        """
+        if self._proc is not None:
+            return
+
+        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+        cmd = [
+            self._ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+            # raw rgb24 frames on stdin
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}',
+            '-r', str(self._fps), '-i', '-',
+            # yuv420p output plays back everywhere
+            '-an', '-c:v', self._codec, '-pix_fmt', 'yuv420p',
+            str(self._output_path),
+        ]
+        self._stderr_file = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stderr=self._stderr_file,
+            )
+        except FileNotFoundError as e:
+            self._stderr_file.close()
+            self._stderr_file = None
+            raise RuntimeError(f'ffmpeg executable not found: {self._ffmpeg}') from e
+
+        logger.info(
+            'writing video to %s with ffmpeg %s (%dx%d @ %.2f fps)',
+            self._output_path, self._codec, width, height, self._fps,
+        )
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        """Write a single rendered frame.
+
+        Args:
+            frame: image array of shape (H, W, 3), dtype uint8, RGB order
+
+        Raises:
+            RuntimeError: if the ffmpeg process has exited
+        """
+        h, w = frame.shape[:2]
+        self._ensure_process(h, w)
+        try:
+            self._proc.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError as e:
+            raise RuntimeError(f'ffmpeg exited early: {self._stderr()}') from e
+        self._frame_count += 1
+
+    def close(self) -> None:
+        """Finish encoding and wait for ffmpeg to exit.
+
+        Raises:
+            RuntimeError: if ffmpeg exits with an error
+        """
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            if proc.wait() != 0:
+                raise RuntimeError(
+                    f'ffmpeg failed writing {self._output_path}: {self._stderr(proc)}'
+                )
+        finally:
+            self._stderr_file.close()
+            self._stderr_file = None
+        logger.info(
+            'wrote %d frames to %s', self._frame_count, self._output_path,
+        )
+
+    def _stderr(self, proc: subprocess.Popen | None = None) -> str:
+        """Collect ffmpeg's error output after it has exited.
+
+        Args:
+            proc: the ffmpeg process; defaults to the running one
+
+        Returns:
+            the decoded error output
+        """
+        proc = proc or self._proc
+        proc.wait()
+        self._stderr_file.seek(0)
+        return self._stderr_file.read().decode(errors='replace').strip()
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames written so far."""
+        return self._frame_count
@@ -0,0 +1,73 @@
+"""Runs another writer on a background thread."""
+
+import queue
+import threading
+
+import numpy as np
+
+from filterworld.writers.base import Writer
+
+_DEFAULT_MAXSIZE = 16
+
+
+class ThreadedWriter(Writer):
+    """Hands frames to a wrapped writer running on a dedicated thread.
+
+    Encoding then overlaps with decoding, inference and rendering of the
+    following frames. Frames are copied on submission, since callers such
+    as the canvas reuse their output buffer, and queued in a bounded queue
+    so a slow encoder applies back-pressure instead of growing memory.
+
+    Errors raised by the wrapped writer are re-raised from the next call to
+    `write_frame` or `close`.
+
+    Args:
+        writer: writer that encodes the frames
+        maxsize: maximum number of frames waiting to be encoded
+    """
+
+    def __init__(self, writer: Writer, maxsize: int = _DEFAULT_MAXSIZE) -> None:
+        self._writer = writer
+        self._queue: queue.Queue[np.ndarray | None] = queue.Queue(maxsize=maxsize)
+        self._error: Exception | None = None
+        self._thread: threading.Thread | None = threading.Thread(
+            target=self._run, name='filterworld-writer', daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Write queued frames until the end-of-stream sentinel arrives."""
+        while (frame := self._queue.get()) is not None:
+            if self._error is not None:
+                # keep draining so the producer never blocks on a full queue
+                continue
+            try:
+                self._writer.write_frame(frame)
+            except Exception as e:
+                self._error = e
+
+    def _raise_error(self) -> None:
+        """Re-raise an error from the writer thread, if there was one."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        """Queue a copy of a rendered frame for writing.
+
+        Args:
+            frame: image array of shape (H, W, 3), dtype uint8, RGB order
+        """
+        self._raise_error()
+        if self._thread is None:
+            raise RuntimeError('writer is closed')
+        self._queue.put(frame.copy())
+
+    def close(self) -> None:
+        """Wait for queued frames to be written, then close the wrapped writer."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._writer.close()
+        self._raise_error()
@@ -20,10 +20,15 @@ class VideoWriter(Writer):
     call to `write_frame`, so frame dimensions do not need to be known
     at construction time.
 
+    Encoding uses any hardware encoder OpenCV's backend exposes for the
+    codec (e.g. NVENC, VA-API or Quick Sync for 'avc1') and falls back to
+    the CPU encoder when there is none.
+
     Args:
         output_path: path for the output video file
         fps: frames per second for the output video
         fourcc: four-character codec code (default 'mp4v')
+        hw_accel: whether to request hardware-accelerated encoding
     """
 
     def __init__(
@@ -31,11 +36,15 @@ class VideoWriter(Writer):
         output_path: str,
         fps: float = _DEFAULT_FPS,
         fourcc: str = 'mp4v',
+        hw_accel: bool = True,
     ) -> None:
         self._output_path = Path(output_path)
         self._fps = fps
-        self._fourcc = fourcc
+        self._fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self._hw_accel = hw_accel
         self._writer: cv2.VideoWriter | None = None
+        # BGR copy of the current frame, reused across frames
+        self._bgr: np.ndarray | None = None
         self._frame_count = 0
 
     def _ensure_writer(self, height: int, width: int) -> None:
@@ -49,16 +58,29 @@ class VideoWriter(Writer):
             return
 
         self._output_path.parent.mkdir(parents=True, exist_ok=True)
-        fourcc = cv2.VideoWriter_fourcc(*self._fourcc)
-        self._writer = cv2.VideoWriter(
-            str(self._output_path), fourcc, self._fps, (width, height),
-        )
+        self._writer = None
+        if self._hw_accel:
+            self._writer = cv2.VideoWriter(
+                str(self._output_path), cv2.CAP_ANY, self._fourcc, self._fps, (width, height),
+                [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+        if self._writer is None or not self._writer.isOpened():
+            # some backends refuse the hardware params outright
+            self._writer = cv2.VideoWriter(
+                str(self._output_path), self._fourcc, self._fps, (width, height),
+            )
         if not self._writer.isOpened():
             raise RuntimeError(f'failed to open video writer: {self._output_path}')
 
+        hw_encode = (
+            int(self._writer.get(cv2.VIDEOWRITER_PROP_HW_ACCELERATION))
+            != cv2.VIDEO_ACCELERATION_NONE
+        )
+
         logger.info(
-            'writing video to %s (%dx%d @ %.2f fps)',
+            'writing video to %s (%dx%d @ %.2f fps, %s encode)',
             self._output_path, width, height, self._fps,
+            'hardware' if hw_encode else 'software',
         )
 
     def write_frame(self, frame: np.ndarray) -> None:
@@ -69,9 +91,11 @@ class VideoWriter(Writer):
         """
         h, w = frame.shape[:2]
         self._ensure_writer(h, w)
+        if self._bgr is None or self._bgr.shape != frame.shape:
+            self._bgr = np.empty_like(frame)
         # convert RGB to BGR for OpenCV
-        bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-        self._writer.write(bgr)
+        cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=self._bgr)
+        self._writer.write(self._bgr)
         self._frame_count += 1
 
     def close(self) -> None:
@@ -1,9 +1,16 @@
 """Tests for filterworld.canvas.canvas."""
 
+import cv2
 import numpy as np
 import pytest
 
-from filterworld.canvas.canvas import Canvas, GridLayout, _build_layer
+from filterworld.canvas.canvas import (
+    Canvas,
+    GridLayout,
+    _build_layer,
+    _interpolation_flag,
+    _resize_interpolation,
+)
 from filterworld.config import Config, LayoutConfig, OutputConfig, PaneConfig
 from filterworld.filters.base import FilterOutput
 from filterworld.layers.feature_layer import FeatureLayer
@@ -27,12 +34,47 @@ class TestBuildLayer:
         })
         assert isinstance(layer, FeatureLayer)
 
+    def test_build_layer_does_not_mutate_config(self):
+        """The layer dict from the config is left untouched."""
+        layer_dict = {'type': 'image', 'opacity': 0.5}
+        _build_layer(layer_dict)
+        assert layer_dict == {'type': 'image', 'opacity': 0.5}
+
     def test_build_unknown_layer_raises(self):
         """Unknown layer type raises ValueError."""
         with pytest.raises(ValueError, match='unknown layer type'):
             _build_layer({'type': 'nonexistent'})
 
 
+class TestInterpolationFlag:
+    """Test the function _interpolation_flag."""
+
+    def test_interpolation_flag_names(self):
+        """Known names map to cv2 flags and None stays automatic."""
+        assert _interpolation_flag('nearest') == cv2.INTER_NEAREST
+        assert _interpolation_flag(None) is None
+
+    def test_interpolation_flag_unknown_raises(self):
+        """Unknown interpolation names raise ValueError."""
+        with pytest.raises(ValueError, match='unknown interpolation'):
+            _interpolation_flag('cubic-ish')
+
+
+class TestResizeInterpolation:
+    """Test the function _resize_interpolation."""
+
+    def test_resize_interpolation_integer_downscale(self, sample_frame):
+        """Integer-factor downscales use INTER_AREA."""
+        assert _resize_interpolation(sample_frame, 32, 32) == cv2.INTER_AREA
+        assert _resize_interpolation(sample_frame, 16, 32) == cv2.INTER_AREA
+
+    def test_resize_interpolation_other_ratios(self, sample_frame):
+        """Upscales, identity and non-integer downscales use INTER_LINEAR."""
+        assert _resize_interpolation(sample_frame, 128, 128) == cv2.INTER_LINEAR
+        assert _resize_interpolation(sample_frame, 64, 64) == cv2.INTER_LINEAR
+        assert _resize_interpolation(sample_frame, 48, 48) == cv2.INTER_LINEAR
+
+
 class TestGridLayout:
     """Test the class GridLayout."""
 
@@ -48,6 +90,61 @@ class TestGridLayout:
         result = layout.arrange([sample_frame, sample_frame])
         assert result.shape == (64, 128, 3)
 
+    def test_grid_layout_places_panes_in_cells(self, sample_frame):
+        """Each pane is resized into its own cell of the output frame."""
+        left = np.full_like(sample_frame, 50)
+        right = np.full_like(sample_frame, 200)
+        layout = GridLayout(width=128, height=64, n_cols=2)
+        result = layout.arrange([left, right])
+        assert np.all(result[:, :64] == 50)
+        assert np.all(result[:, 64:] == 200)
+
+    def test_grid_layout_opencl_matches_host(self, sample_frame):
+        """Composing through UMat gives the same frame as the host path."""
+        panes = [sample_frame, np.full_like(sample_frame, 90), sample_frame]
+        host = GridLayout(width=128, height=100, n_cols=2, use_opencl=False)
+        umat = GridLayout(width=128, height=100, n_cols=2, use_opencl=True)
+        expected = host.arrange(panes).copy()
+        result = umat.arrange(panes)
+        assert isinstance(result, np.ndarray)
+        np.testing.assert_array_equal(result, expected)
+        # second frame reuses the device buffers
+        np.testing.assert_array_equal(umat.arrange(panes), expected)
+
+    def test_grid_layout_opencl_is_opt_in(self):
+        """The host path is used unless OpenCL is requested."""
+        assert GridLayout(width=64, height=64).use_opencl is False
+
+    def test_grid_layout_2x_downscale_is_block_average(self, sample_frame):
+        """Halving a pane averages each 2x2 block with round-half-up."""
+        layout = GridLayout(width=64, height=32, n_cols=2)
+        result = layout.arrange([sample_frame, sample_frame])
+        blocks = sample_frame.astype(np.uint16).reshape(32, 2, 32, 2, 3).sum(axis=(1, 3))
+        expected = ((blocks + 2) >> 2).astype(np.uint8)
+        np.testing.assert_array_equal(result[:, :32], expected)
+        np.testing.assert_array_equal(result[:, 32:], expected)
+
+    def test_grid_layout_non_divisible_size(self, sample_frame):
+        """Leftover columns beyond the last full cell stay black."""
+        frame = np.full_like(sample_frame, 255)
+        layout = GridLayout(width=131, height=67, n_cols=2)
+        result = layout.arrange([frame, frame, frame])
+        assert result.shape == (67, 131, 3)
+        assert np.all(result[:66, :65] == 255)
+        assert np.all(result[:33, 65:130] == 255)
+        assert np.all(result[33:66, 65:130] == 0)
+        assert np.all(result[66:] == 0)
+        assert np.all(result[:, 130:] == 0)
+
+    def test_grid_layout_explicit_interpolation(self):
+        """A per-pane interpolation overrides automatic selection."""
+        checker = np.zeros((2, 2, 3), dtype=np.uint8)
+        checker[0, 0] = checker[1, 1] = 255
+        layout = GridLayout(width=8, height=4, n_cols=2)
+        result = layout.arrange([checker, checker], [cv2.INTER_NEAREST, None])
+        assert set(np.unique(result[:, :4])) == {0, 255}
+        assert len(np.unique(result[:, 4:])) > 2
+
     def test_grid_layout_empty(self):
         """Empty panes returns a black frame."""
         layout = GridLayout(width=64, height=64)
@@ -55,6 +152,22 @@ class TestGridLayout:
         assert result.shape == (64, 64, 3)
         assert np.all(result == 0)
 
+    def test_grid_layout_reuses_output_buffer(self, sample_frame):
+        """The output frame is allocated once and reused across calls."""
+        layout = GridLayout(width=128, height=64, n_cols=2)
+        first = layout.arrange([sample_frame, sample_frame])
+        second = layout.arrange([sample_frame, sample_frame])
+        assert first is second
+
+    def test_grid_layout_uncovered_cells_are_black(self, sample_frame):
+        """Grid cells without a pane stay black."""
+        frame = np.full_like(sample_frame, 255)
+        layout = GridLayout(width=128, height=128, n_cols=2)
+        layout.arrange([frame, frame, frame])
+        result = layout.arrange([frame, frame, frame])
+        assert np.all(result[64:, 64:] == 0)
+        assert np.all(result[:64, :64] == 255)
+
 
 class TestCanvas:
     """Test the class Canvas."""
@@ -66,6 +179,30 @@ class TestCanvas:
         result = canvas.render(sample_frame, FilterOutput())
         assert result.shape == sample_frame.shape
 
+    def test_canvas_use_gpu_override(self):
+        """An explicit use_gpu overrides CUDA auto-detection."""
+        assert Canvas(Config(), use_gpu=True).use_gpu
+        assert not Canvas(Config(), use_gpu=False).use_gpu
+
+    def test_canvas_requires_filter_output(self):
+        """Only canvases with a visible feature layer need the filter output."""
+        assert not Canvas(Config()).requires_filter_output
+
+        def _config(opacity):
+            layers = [{'type': 'image'}, {'type': 'feature', 'opacity': opacity}]
+            return Config(panes=[PaneConfig(layers=layers)])
+
+        assert Canvas(_config(0.5)).requires_filter_output
+        assert not Canvas(_config(0.0)).requires_filter_output
+
+    def test_canvas_frame_size_change(self, sample_frame):
+        """A new frame size rebuilds the layout to match."""
+        canvas = Canvas(Config())
+        canvas.render(sample_frame, FilterOutput())
+        larger = np.zeros((96, 80, 3), dtype=np.uint8)
+        result = canvas.render(larger, FilterOutput())
+        assert result.shape == larger.shape
+
     def test_canvas_from_config(self, sample_frame):
         """Canvas builds from config with multiple panes."""
         config = Config(
@@ -79,3 +216,37 @@ class TestCanvas:
         assert len(canvas.panes) == 2
         result = canvas.render(sample_frame, FilterOutput())
         assert result.shape[2] == 3
+
+    def test_canvas_passthrough_returns_frame(self, sample_frame):
+        """A lone opaque image layer at the input size returns the frame itself."""
+        canvas = Canvas(Config())
+        assert canvas.render(sample_frame, FilterOutput()) is sample_frame
+
+    def test_canvas_passthrough_needs_matching_size(self, sample_frame):
+        """Resizing to a different output size still renders a new frame."""
+        canvas = Canvas(Config(output=OutputConfig(width=32, height=32)))
+        result = canvas.render(sample_frame, FilterOutput())
+        assert result is not sample_frame
+        assert result.shape == (32, 32, 3)
+
+    def test_canvas_multi_pane_matches_sequential(self, sample_frame):
+        """Concurrent pane rendering places each pane in its own cell."""
+        config = Config(
+            layout=LayoutConfig(type='grid', rows=1, cols=2),
+            panes=[
+                PaneConfig(layers=[{'type': 'image'}], label='left'),
+                PaneConfig(layers=[{'type': 'image', 'opacity': 0.0}], label='right'),
+            ],
+        )
+        canvas = Canvas(config)
+        result = canvas.render(sample_frame, FilterOutput())
+        canvas.close()
+        np.testing.assert_array_equal(result[:, :64], sample_frame)
+        assert np.all(result[:, 64:] == 0)
+
+    def test_canvas_close_idempotent(self):
+        """Calling close twice does not raise."""
+        config = Config(panes=[PaneConfig(layers=[{'type': 'image'}])] * 2)
+        canvas = Canvas(config)
+        canvas.close()
+        canvas.close()
@@ -29,3 +29,29 @@ class TestPane:
         result = pane.render(sample_frame, FilterOutput())
         assert result.shape == sample_frame.shape
         assert np.all(result == 0)
+
+    def test_pane_opaque_bottom_layer_overwrites_target(self, sample_frame):
+        """An opaque bottom layer fully overwrites the previous frame's target."""
+        pane = Pane(layers=[ImageLayer(opacity=1.0)])
+        pane.render(np.full_like(sample_frame, 255), FilterOutput())
+        result = pane.render(sample_frame, FilterOutput())
+        np.testing.assert_array_equal(result, sample_frame)
+
+    def test_pane_reuses_target_buffer(self, sample_frame):
+        """The blank target is allocated once and re-zeroed on each render."""
+        pane = Pane(layers=[ImageLayer(opacity=0.5)])
+        pane.render(sample_frame, FilterOutput())
+        buffer = pane._target
+        pane.render(sample_frame, FilterOutput())
+        assert pane._target is buffer
+        expected = np.rint(sample_frame.astype(np.float32) * 0.5).astype(np.uint8)
+        np.testing.assert_array_equal(pane.render(sample_frame, FilterOutput()), expected)
+
+    def test_pane_reset_buffers(self, sample_frame):
+        """reset_buffers drops the target, which is reallocated on next render."""
+        pane = Pane()
+        pane.render(sample_frame, FilterOutput())
+        pane.reset_buffers()
+        assert pane._target is None
+        result = pane.render(sample_frame, FilterOutput())
+        assert np.all(result == 0)
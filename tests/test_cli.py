@@ -18,6 +18,7 @@ class TestParseArgs:
         assert args.model == 'identity'
         assert args.config is None
         assert args.output is None
+        assert args.batch_size is None
 
     def test_parse_args_precompute(self):
         """Precompute subcommand parses correctly."""
@@ -26,6 +27,25 @@ class TestParseArgs:
         assert args.video == 'video.mp4'
         assert args.model == 'dinov2-small'
         assert args.output == 'pca.npz'
+        assert args.batch_size == 32
+
+    def test_parse_args_extract(self):
+        """Extract subcommand parses correctly."""
+        args = parse_args(['extract', 'video.mp4', 'dinov2-small', '-o', 'features.npy'])
+        assert args.command == 'extract'
+        assert args.output == 'features.npy'
+        assert args.batch_size == 32
+
+    @pytest.mark.parametrize('command', [
+        ['run', 'video.mp4', 'identity'],
+        ['precompute', 'video.mp4', 'dinov2-small', '-o', 'pca.npz'],
+        ['extract', 'video.mp4', 'dinov2-small', '-o', 'features.npy'],
+    ])
+    @pytest.mark.parametrize('batch_size', ['0', '-2', 'four'])
+    def test_parse_args_rejects_invalid_batch_size(self, command, batch_size):
+        """Batch sizes that are not positive integers are rejected."""
+        with pytest.raises(SystemExit):
+            parse_args([*command, '--batch-size', batch_size])
 
     def test_parse_args_no_command(self):
         """No subcommand raises SystemExit."""
@@ -21,7 +21,7 @@ class TestLoadConfig:
         config_data = {
             'layout': {'type': 'grid', 'rows': 2, 'cols': 3},
             'panes': [
-                {'layers': [{'type': 'image'}], 'label': 'pane1'},
+                {'layers': [{'type': 'image'}], 'label': 'pane1', 'interpolation': 'nearest'},
             ],
             'output': {'fps': 24.0, 'codec': 'avc1'},
         }
@@ -33,6 +33,7 @@ class TestLoadConfig:
         assert config.layout.cols == 3
         assert len(config.panes) == 1
         assert config.panes[0].label == 'pane1'
+        assert config.panes[0].interpolation == 'nearest'
         assert config.output.fps == 24.0
         assert config.output.codec == 'avc1'
 
@@ -51,6 +52,7 @@ class TestDataclasses:
         assert layout.type == 'grid'
         assert layout.rows == 1
         assert layout.cols == 1
+        assert layout.opencl is False
 
     def test_output_config_defaults(self):
         """OutputConfig has sensible defaults."""
@@ -65,3 +67,4 @@ class TestDataclasses:
         pane = PaneConfig()
         assert pane.layers == []
         assert pane.label is None
+        assert pane.interpolation is None
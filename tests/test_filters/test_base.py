@@ -12,7 +12,7 @@ class TestFilterOutput:
         """FilterOutput has correct defaults."""
         output = FilterOutput()
         assert output.frame_idx == 0
-        assert output.metadata == {}
+        assert output.metadata is None
 
     def test_filter_output_custom(self):
         """FilterOutput accepts custom values."""
@@ -20,6 +20,11 @@ class TestFilterOutput:
         assert output.frame_idx == 5
         assert output.metadata == {'key': 'value'}
 
+    def test_filter_output_slots(self):
+        """FilterOutput subclasses are slotted and have no instance dict."""
+        assert not hasattr(FilterOutput(), '__dict__')
+        assert not hasattr(FeatureOutput(), '__dict__')
+
 
 class TestFeatureOutput:
     """Test the class FeatureOutput."""
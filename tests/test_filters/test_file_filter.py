@@ -0,0 +1,44 @@
+"""Tests for filterworld.filters.file_filter."""
+
+import numpy as np
+import pytest
+
+from filterworld.filters.base import FeatureOutput
+from filterworld.filters.file_filter import FileFilter
+
+
+@pytest.fixture
+def features_path(tmp_path):
+    """Save a (3, 16, 4, 4) float16 feature file, return its path."""
+    path = tmp_path / 'features.npy'
+    np.save(path, np.random.randn(3, 16, 4, 4).astype(np.float16))
+    return path
+
+
+class TestFileFilter:
+    """Test the class FileFilter."""
+
+    def test_file_filter_replays_features(self, features_path, sample_frame):
+        """Each call returns the next stored frame as float32 features."""
+        stored = np.load(features_path)
+        f = FileFilter(str(features_path))
+        for idx in range(3):
+            output = f.process_frame(sample_frame)
+            assert isinstance(output, FeatureOutput)
+            assert output.frame_idx == idx
+            assert output.features.dtype == np.float32
+            np.testing.assert_array_equal(output.features, stored[idx])
+
+    def test_file_filter_past_end_raises(self, features_path, sample_frame):
+        """Requesting more frames than stored raises ValueError."""
+        f = FileFilter(str(features_path))
+        f.process_batch([sample_frame] * 3)
+        with pytest.raises(ValueError, match='has 3 frames'):
+            f.process_frame(sample_frame)
+
+    def test_file_filter_unsupported_format(self, tmp_path):
+        """Non-.npy files raise ValueError."""
+        path = tmp_path / 'outputs.json'
+        path.write_text('{}')
+        with pytest.raises(ValueError, match='unsupported pre-computed output format'):
+            FileFilter(str(path))
@@ -24,3 +24,9 @@ class TestIdentityFilter:
         assert out0.frame_idx == 0
         assert out1.frame_idx == 1
         assert out2.frame_idx == 2
+
+    def test_identity_filter_process_batch(self, sample_frame):
+        """process_batch returns one output per frame with consecutive indices."""
+        f = IdentityFilter()
+        outputs = f.process_batch([sample_frame, sample_frame, sample_frame])
+        assert [out.frame_idx for out in outputs] == [0, 1, 2]
@@ -0,0 +1,59 @@
+"""Tests for filterworld.filters.preprocess."""
+
+import numpy as np
+import pytest
+import torch
+from transformers import BitImageProcessor, ViTImageProcessor
+from transformers.models.dinov3_vit.image_processing_dinov3_vit import DINOv3ViTImageProcessor
+
+from filterworld.filters.preprocess import DevicePreprocessor
+
+
+@pytest.fixture
+def smooth_frames():
+    """Return two 48x80 RGB frames with smooth gradients."""
+    y, x = np.mgrid[0:48, 0:80]
+    frame = np.stack([x * 3, y * 5, (x + y) * 2], axis=-1).clip(0, 255).astype(np.uint8)
+    return [frame, frame[::-1].copy()]
+
+
+def _reference(processor, frames):
+    """Run the Hugging Face processor itself."""
+    pixel_values = processor(images=frames, return_tensors='np')['pixel_values']
+    return torch.as_tensor(np.asarray(pixel_values))
+
+
+class TestDevicePreprocessor:
+    """Test the class DevicePreprocessor."""
+
+    def test_device_preprocessor_fixed_size(self, smooth_frames):
+        """Fixed-size bilinear resize matches the processor to one uint8 step."""
+        processor = ViTImageProcessor(size={'height': 32, 'width': 32})
+        result = DevicePreprocessor(processor, torch.device('cpu'))(smooth_frames)
+        expected = _reference(processor, smooth_frames)
+        assert result.shape == (2, 3, 32, 32)
+        # one uint8 step after normalization with std 0.5
+        assert (result - expected).abs().max() <= 2 / 255 + 1e-6
+
+    def test_device_preprocessor_shortest_edge_crop(self, smooth_frames):
+        """Shortest-edge resize and center crop match the processor's output."""
+        processor = BitImageProcessor(
+            size={'shortest_edge': 40}, crop_size={'height': 32, 'width': 32},
+        )
+        result = DevicePreprocessor(processor, torch.device('cpu'))(smooth_frames)
+        expected = _reference(processor, smooth_frames)
+        assert result.shape == expected.shape == (2, 3, 32, 32)
+        assert (result - expected).abs().mean() < 0.01
+
+    def test_device_preprocessor_rescale_first(self, smooth_frames):
+        """Processors that rescale before resizing are matched exactly."""
+        processor = DINOv3ViTImageProcessor(size={'height': 32, 'width': 32})
+        preprocess = DevicePreprocessor(processor, torch.device('cpu'), rescale_first=True)
+        result = preprocess(smooth_frames)
+        np.testing.assert_allclose(result, _reference(processor, smooth_frames), atol=1e-5)
+
+    def test_device_preprocessor_dtype(self, smooth_frames):
+        """The model input is returned in the requested dtype."""
+        processor = ViTImageProcessor(size={'height': 32, 'width': 32})
+        preprocess = DevicePreprocessor(processor, torch.device('cpu'), dtype=torch.bfloat16)
+        assert preprocess(smooth_frames).dtype == torch.bfloat16
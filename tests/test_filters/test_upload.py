@@ -0,0 +1,28 @@
+"""Tests for filterworld.filters.upload."""
+
+import numpy as np
+import pytest
+import torch
+
+from filterworld.filters.upload import PinnedUploader
+
+
+class TestPinnedUploader:
+    """Test the class PinnedUploader."""
+
+    def test_pinned_uploader_stacks_on_cpu(self, sample_frame):
+        """On the CPU, arrays are stacked into one tensor of the same dtype."""
+        uploader = PinnedUploader(torch.device('cpu'))
+        batch = uploader.upload([sample_frame, sample_frame[::-1]])
+        assert batch.shape == (2, 64, 64, 3)
+        assert batch.dtype == torch.uint8
+        np.testing.assert_array_equal(batch[1].numpy(), sample_frame[::-1])
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason='no CUDA device')
+    def test_pinned_uploader_reuses_staging_on_cuda(self, sample_frame):
+        """On CUDA, batches match their inputs while staging buffers are reused."""
+        uploader = PinnedUploader(torch.device('cuda'))
+        frames = [np.full_like(sample_frame, i) for i in range(3)]
+        batches = [uploader.upload([frame]) for frame in frames]
+        for frame, batch in zip(frames, batches):
+            np.testing.assert_array_equal(batch[0].cpu().numpy(), frame)
@@ -0,0 +1,90 @@
+"""Tests for filterworld.filters.vit_filter."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from transformers import ViTConfig, ViTImageProcessor, ViTModel
+
+from filterworld.filters import (
+    dinov1_filter,
+    dinov2_filter,
+    dinov3_filter,
+    vit_filter,
+    vitmae_filter,
+)
+
+
+def _load_tiny(model_name, processor_kwargs):
+    """Build a tiny random ViT and its processor instead of downloading one."""
+    config = ViTConfig(
+        hidden_size=32, num_hidden_layers=1, num_attention_heads=2, intermediate_size=64,
+        image_size=64, patch_size=16,
+    )
+    return ViTImageProcessor(**processor_kwargs), ViTModel(config, add_pooling_layer=False)
+
+
+class TestViTFilter:
+    """Test the class ViTFilter."""
+
+    def test_vit_filter_batch_matches_frames(self, sample_frame):
+        """A batched forward pass gives the same features as one frame at a time."""
+        frames = [sample_frame, sample_frame[::-1].copy(), sample_frame[:, ::-1].copy()]
+        with patch.dict(vit_filter._MODEL_CACHE, clear=True), patch.object(
+            dinov1_filter, '_load_dinov1', side_effect=_load_tiny,
+        ):
+            f = dinov1_filter.DINOv1Filter('tiny', resolution=64)
+            single = [f.process_frame(frame) for frame in frames]
+            batch = f.process_batch(frames)
+        assert [output.frame_idx for output in single + batch] == list(range(6))
+        for a, b in zip(single, batch):
+            assert b.features.shape == (32, 4, 4)
+            assert b.features.flags['C_CONTIGUOUS']
+            np.testing.assert_allclose(a.features, b.features, atol=1e-5)
+
+    def test_vit_filter_pads_short_batches(self, sample_frame):
+        """Short batches padded to the compiled batch size return only their own frames."""
+        frames = [sample_frame, sample_frame[::-1].copy()]
+        with patch.dict(vit_filter._MODEL_CACHE, clear=True), patch.object(
+            dinov1_filter, '_load_dinov1', side_effect=_load_tiny,
+        ):
+            f = dinov1_filter.DINOv1Filter('tiny', resolution=64, batch_size=4)
+            expected = f.process_batch(frames)
+            # exercise the padding path without compiling
+            f._compiled = True
+            result = f.process_batch(frames)
+        assert len(result) == 2
+        for a, b in zip(expected, result):
+            np.testing.assert_allclose(a.features, b.features, atol=1e-5)
+
+    def test_vit_filter_invalid_batch_size_raises(self):
+        """A batch_size below 1 raises ValueError before any model is loaded."""
+        with patch.object(dinov1_filter, '_load_dinov1') as load:
+            with pytest.raises(ValueError, match='batch_size must be at least 1'):
+                dinov1_filter.DINOv1Filter('tiny', batch_size=0)
+        load.assert_not_called()
+
+
+class TestModelCache:
+    """Test the model cache shared by ViTFilter subclasses."""
+
+    @pytest.mark.parametrize('module, loader, filter_name', [
+        (dinov1_filter, '_load_dinov1', 'DINOv1Filter'),
+        (dinov2_filter, '_load_dinov2', 'DINOv2Filter'),
+        (dinov3_filter, '_load_dinov3', 'DINOv3Filter'),
+        (vitmae_filter, '_load_vitmae', 'ViTMAEFilter'),
+    ])
+    def test_model_loaded_once_per_name_and_resolution(
+        self, sample_frame, module, loader, filter_name,
+    ):
+        """Filters with the same model and resolution share one loaded model."""
+        filter_cls = getattr(module, filter_name)
+        with patch.dict(vit_filter._MODEL_CACHE, clear=True), patch.object(
+            module, loader, side_effect=_load_tiny,
+        ) as load:
+            f0 = filter_cls('tiny', resolution=64)
+            f1 = filter_cls('tiny', resolution=64)
+            filter_cls('tiny', resolution=32)
+            assert load.call_count == 2
+            assert f0.model is f1.model
+            assert f1.process_frame(sample_frame).features.shape == (32, 4, 4)
@@ -2,6 +2,7 @@
 
 import numpy as np
 import pytest
+import torch
 
 from filterworld.filters.base import FeatureOutput, FilterOutput
 from filterworld.layers.feature_layer import FeatureLayer
@@ -17,6 +18,95 @@ class TestFeatureLayer:
         assert result.dtype == np.uint8
         assert result.shape == (8, 8, 3)
 
+    def test_reduce_first3_normalizes_each_channel(self):
+        """Each channel is stretched to 0-255 and constant channels map to 0."""
+        features = np.zeros((4, 2, 2), dtype=np.float32)
+        features[0] = [[1.0, 2.0], [3.0, 5.0]]
+        features[1] = 7.0
+        features[2] = [[-1.0, 0.0], [0.0, 1.0]]
+        layer = FeatureLayer(method='first3')
+        result = layer._reduce_first3(features)
+        np.testing.assert_array_equal(result[:, :, 0], [[0, 63], [127, 255]])
+        np.testing.assert_array_equal(result[:, :, 1], 0)
+        np.testing.assert_array_equal(result[:, :, 2], [[0, 127], [127, 255]])
+
+    def test_reduce_first3_channel_max_maps_to_255(self):
+        """Every channel spans exactly 0-255, on both the numpy and torch paths."""
+        layer = FeatureLayer(method='first3')
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            features = rng.standard_normal((4, 5, 7)).astype(np.float32)
+            for result in (
+                layer._reduce_first3(features), layer._reduce(torch.from_numpy(features)),
+            ):
+                np.testing.assert_array_equal(result.reshape(-1, 3).max(axis=0), 255)
+                np.testing.assert_array_equal(result.reshape(-1, 3).min(axis=0), 0)
+
+    def test_reduce_first3_torch_matches_numpy(self, sample_features):
+        """Reducing a torch tensor gives the same image as the numpy path."""
+        layer = FeatureLayer(method='first3')
+        expected = layer._reduce_first3(sample_features)
+        result = layer._reduce(torch.from_numpy(sample_features))
+        assert isinstance(result, np.ndarray)
+        np.testing.assert_allclose(result.astype(int), expected.astype(int), atol=1)
+
+    def test_reduce_pca_matches_centered_projection(self, sample_features, sample_pca_path):
+        """Folding the mean into a bias matches projecting centered patches."""
+        data = np.load(sample_pca_path)
+        patches = sample_features.reshape(384, 64).T - data['mean']
+        projected = patches @ data['components'].T
+        expected = (projected - projected.min()) / np.ptp(projected) * 255.0
+        layer = FeatureLayer(method='pca', pca_path=str(sample_pca_path))
+        result = layer._reduce_pca(sample_features)
+        np.testing.assert_allclose(
+            result.astype(int), expected.astype(np.uint8).reshape(8, 8, 3).astype(int), atol=1,
+        )
+
+    def test_reduce_pca_max_maps_to_255(self, sample_pca_path):
+        """The projection's global max maps to 255, on both the numpy and torch paths."""
+        layer = FeatureLayer(method='pca', pca_path=str(sample_pca_path))
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            features = rng.standard_normal((384, 4, 4)).astype(np.float32)
+            for result in (
+                layer._reduce_pca(features), layer._reduce(torch.from_numpy(features)),
+            ):
+                assert result.max() == 255
+                assert result.min() == 0
+
+    def test_reduce_pca_torch_bfloat16(self, sample_features, sample_pca_path):
+        """On-device PCA accepts reduced-precision features."""
+        layer = FeatureLayer(method='pca', pca_path=str(sample_pca_path))
+        result = layer._reduce(torch.from_numpy(sample_features).to(torch.bfloat16))
+        assert result.dtype == np.uint8
+        assert result.shape == (8, 8, 3)
+
+    def test_reduce_pca_torch_bfloat16_large_offset(self, tmp_path):
+        """bfloat16 features sharing a large offset project like the numpy path."""
+        rng = np.random.default_rng(0)
+        features = torch.from_numpy(
+            rng.standard_normal((384, 8, 8)).astype(np.float32) + 32.0,
+        ).to(torch.bfloat16)
+        pca_path = tmp_path / 'pca.npz'
+        np.savez(
+            pca_path,
+            components=rng.standard_normal((3, 384)).astype(np.float32),
+            mean=features.float().numpy().mean(axis=(1, 2)),
+        )
+        layer = FeatureLayer(method='pca', pca_path=str(pca_path))
+        expected = layer._reduce_pca(features.float().numpy())
+        result = layer._reduce(features)
+        np.testing.assert_allclose(result.astype(int), expected.astype(int), atol=1)
+
+    def test_reduce_pca_torch_matches_numpy(self, sample_features, sample_pca_path):
+        """On-device PCA gives the same image as the numpy path."""
+        layer = FeatureLayer(method='pca', pca_path=str(sample_pca_path))
+        expected = layer._reduce_pca(sample_features)
+        result = layer._reduce(torch.from_numpy(sample_features))
+        assert isinstance(result, np.ndarray)
+        assert result.dtype == np.uint8
+        np.testing.assert_allclose(result.astype(int), expected.astype(int), atol=1)
+
     def test_reduce_pca_produces_correct_shape(self, sample_features, sample_pca_path):
         """_reduce_pca loads npz and produces correct shape."""
         layer = FeatureLayer(method='pca', pca_path=str(sample_pca_path))
@@ -44,3 +134,21 @@ class TestFeatureLayer:
         result = layer.render(target, sample_frame, feature_output)
         assert result.shape == sample_frame.shape
         assert result.dtype == np.uint8
+
+    def test_render_with_feature_output_in_place(self, sample_frame, sample_features):
+        """Rendering writes into and returns the provided target."""
+        feature_output = FeatureOutput(frame_idx=0, features=sample_features)
+        for opacity in (1.0, 0.5):
+            layer = FeatureLayer(method='first3', opacity=opacity)
+            target = np.zeros_like(sample_frame)
+            result = layer.render(target, sample_frame, feature_output)
+            assert result is target
+
+    def test_render_reuses_blend_buffer(self, sample_frame, sample_features):
+        """Partially transparent renders reuse one upsampling buffer."""
+        layer = FeatureLayer(method='first3', opacity=0.5)
+        feature_output = FeatureOutput(frame_idx=0, features=sample_features)
+        layer.render(np.zeros_like(sample_frame), sample_frame, feature_output)
+        buffer = layer._vis_resized
+        layer.render(np.zeros_like(sample_frame), sample_frame, feature_output)
+        assert layer._vis_resized is buffer
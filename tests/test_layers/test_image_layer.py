@@ -23,7 +23,7 @@ class TestImageLayer:
         layer = ImageLayer(opacity=0.5)
         target = np.zeros_like(sample_frame)
         result = layer.render(target, sample_frame, FilterOutput())
-        expected = (sample_frame.astype(np.float32) * 0.5).astype(np.uint8)
+        expected = np.rint(sample_frame.astype(np.float32) * 0.5).astype(np.uint8)
         np.testing.assert_array_equal(result, expected)
 
     def test_image_layer_zero_opacity(self, sample_frame):
@@ -32,3 +32,15 @@ class TestImageLayer:
         target = np.ones_like(sample_frame) * 128
         result = layer.render(target, sample_frame, FilterOutput())
         np.testing.assert_array_equal(result, target)
+
+    def test_image_layer_renders_in_place(self, sample_frame):
+        """render writes into and returns the provided target."""
+        target = np.zeros_like(sample_frame)
+        for opacity in (1.0, 0.5):
+            result = ImageLayer(opacity=opacity).render(target, sample_frame, FilterOutput())
+            assert result is target
+
+    def test_image_layer_opaque(self):
+        """Only a fully opaque ImageLayer reports itself as opaque."""
+        assert ImageLayer(opacity=1.0).opaque
+        assert not ImageLayer(opacity=0.5).opaque
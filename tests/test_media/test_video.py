@@ -26,6 +26,50 @@ class TestVideoReader:
             assert frame.shape == (64, 64, 3)
             assert frame.dtype == np.uint8
 
+    def test_video_reader_second_pass_requires_rewind(self, tmp_video_path):
+        """Iterating twice raises until the reader is rewound."""
+        reader = VideoReader(str(tmp_video_path))
+        first = list(reader)
+        with pytest.raises(RuntimeError, match='already iterated'):
+            iter(reader)
+        reader.rewind()
+        second = list(reader)
+        assert len(second) == len(first)
+        np.testing.assert_array_equal(second[0], first[0])
+
+    def test_video_reader_software_decode(self, tmp_video_path):
+        """Hardware decoding can be turned off, with identical frames."""
+        frames_hw = list(VideoReader(str(tmp_video_path)))
+        frames_sw = list(VideoReader(str(tmp_video_path), hw_accel=False))
+        assert len(frames_sw) == len(frames_hw)
+        assert frames_sw[0].shape == (64, 64, 3)
+
+    def test_video_reader_context_manager_closes(self, tmp_video_path):
+        """Leaving the with block releases the capture; close is idempotent."""
+        with VideoReader(str(tmp_video_path)) as reader:
+            assert len(list(reader)) == 5
+        with pytest.raises(RuntimeError, match='closed'):
+            iter(reader)
+        reader.close()  # should not raise
+
+    def test_video_reader_rewind_after_close_raises(self, tmp_video_path):
+        """Rewinding a closed reader raises RuntimeError."""
+        with VideoReader(str(tmp_video_path)) as reader:
+            pass
+        with pytest.raises(RuntimeError, match='closed'):
+            reader.rewind()
+
+    def test_video_reader_read_frame(self, tmp_video_path):
+        """read_frame returns the same frames as iteration, in any order."""
+        with VideoReader(str(tmp_video_path)) as reader:
+            frames = list(reader)
+            for idx in [1, 4, 0, 2]:
+                np.testing.assert_array_equal(reader.read_frame(idx), frames[idx])
+            with pytest.raises(IndexError):
+                reader.read_frame(5)
+            with pytest.raises(RuntimeError, match='already iterated'):
+                iter(reader)
+
     def test_video_reader_len(self, tmp_video_path):
         """len(reader) returns frame count."""
         reader = VideoReader(str(tmp_video_path))
@@ -1,13 +1,24 @@
 """Tests for filterworld.pipeline."""
 
+import threading
 from unittest.mock import patch
 
 import numpy as np
 import pytest
 
 from filterworld.filters.base import FilterOutput
+from filterworld.filters.file_filter import FileFilter
 from filterworld.filters.identity_filter import IdentityFilter
-from filterworld.pipeline import Pipeline, build_filter
+from filterworld.pipeline import (
+    Pipeline,
+    _build_writer,
+    _prefetch,
+    _RenderThread,
+    build_filter,
+)
+from filterworld.writers.base import Writer
+from filterworld.writers.ffmpeg_writer import FFmpegWriter
+from filterworld.writers.video_writer import VideoWriter
 
 
 class TestBuildFilter:
@@ -18,6 +29,12 @@ class TestBuildFilter:
         f = build_filter('identity')
         assert isinstance(f, IdentityFilter)
 
+    def test_build_filter_feature_file(self, tmp_path):
+        """An existing .npy feature file returns a FileFilter."""
+        path = tmp_path / 'features.npy'
+        np.save(path, np.zeros((1, 4, 2, 2), dtype=np.float16))
+        assert isinstance(build_filter(str(path)), FileFilter)
+
     def test_build_filter_unknown_raises(self):
         """Unknown model name raises ValueError."""
         with pytest.raises(ValueError, match='unsupported model'):
@@ -32,6 +49,107 @@ class TestBuildFilter:
                 f = build_filter(name)
                 assert isinstance(f, filter_cls)
 
+    def test_build_filter_passes_batch_size(self):
+        """A batch_size reaches the filter's constructor, so it warms up at that size."""
+        from filterworld.pipeline import _MODEL_REGISTRY
+
+        hf_name, filter_cls = _MODEL_REGISTRY['dinov2-small']
+        with patch.object(filter_cls, '__init__', return_value=None) as mock_init:
+            build_filter('dinov2-small', batch_size=32)
+        mock_init.assert_called_once_with(hf_name, resolution=None, batch_size=32)
+
+
+class TestBuildWriter:
+    """Test the function _build_writer."""
+
+    def test_build_writer_fourcc(self, tmp_path):
+        """Four-character codecs use OpenCV's writer."""
+        writer = _build_writer(str(tmp_path / 'out.mp4'), 30.0, 'mp4v')
+        assert isinstance(writer, VideoWriter)
+
+    def test_build_writer_ffmpeg_encoder(self, tmp_path):
+        """Other codec names are ffmpeg encoders."""
+        writer = _build_writer(str(tmp_path / 'out.mp4'), 30.0, 'libx264')
+        assert isinstance(writer, FFmpegWriter)
+
+
+class TestPrefetch:
+    """Test the function _prefetch."""
+
+    def test_prefetch_preserves_order(self):
+        """Frames come out in the order they were read."""
+        frames = [np.full((2, 2, 3), idx, dtype=np.uint8) for idx in range(20)]
+        result = list(_prefetch(frames, maxsize=3))
+        assert [int(frame[0, 0, 0]) for frame in result] == list(range(20))
+
+    def test_prefetch_reraises_reader_errors(self):
+        """Errors raised while reading surface in the consumer."""
+        def _frames():
+            yield np.zeros((2, 2, 3), dtype=np.uint8)
+            raise RuntimeError('decode failed')
+
+        it = _prefetch(_frames())
+        next(it)
+        with pytest.raises(RuntimeError, match='decode failed'):
+            next(it)
+
+    def test_prefetch_close_stops_reader(self):
+        """Closing the iterator early stops the reader thread."""
+        def _frames():
+            while True:
+                yield np.zeros((2, 2, 3), dtype=np.uint8)
+
+        it = _prefetch(_frames(), maxsize=2)
+        next(it)
+        it.close()
+        assert not any(t.name == 'filterworld-reader' for t in threading.enumerate())
+
+
+class _ListWriter(Writer):
+    """Collects written frames in memory."""
+
+    def __init__(self) -> None:
+        self.frames = []
+
+    def write_frame(self, frame):
+        self.frames.append(frame)
+
+    def close(self):
+        pass
+
+
+class _IndexCanvas:
+    """Renders each frame as its filter output's frame index."""
+
+    def render(self, frame, filter_output):
+        if filter_output.frame_idx < 0:
+            raise ValueError('bad frame')
+        return np.full_like(frame, filter_output.frame_idx)
+
+
+class TestRenderThread:
+    """Test the class _RenderThread."""
+
+    def test_render_thread_renders_in_order(self):
+        """Batches are rendered and written in submission order."""
+        writer = _ListWriter()
+        renderer = _RenderThread(_IndexCanvas(), writer)
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        for start in range(0, 9, 3):
+            outputs = [FilterOutput(frame_idx=idx) for idx in range(start, start + 3)]
+            renderer.submit([frame] * 3, outputs)
+        renderer.close()
+        assert [int(f[0, 0, 0]) for f in writer.frames] == list(range(9))
+
+    def test_render_thread_reraises_errors(self):
+        """Errors in the render thread surface in the caller."""
+        renderer = _RenderThread(_IndexCanvas(), _ListWriter())
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        with pytest.raises(ValueError, match='bad frame'):
+            for _ in range(50):
+                renderer.submit([frame], [FilterOutput(frame_idx=-1)])
+            renderer.close()
+
 
 class TestPipeline:
     """Test the class Pipeline."""
@@ -47,3 +165,74 @@ class TestPipeline:
         )
         pipeline.run()
         assert output_path.exists()
+
+    def test_pipeline_skips_unused_model(self, tmp_video_path, tmp_path):
+        """The model is not built when no layer displays its output."""
+        pipeline = Pipeline(
+            video_path=str(tmp_video_path),
+            model_path='dinov2-small',
+            config_path=None,
+            output_path=str(tmp_path / 'output.mp4'),
+        )
+        with patch('filterworld.pipeline.build_filter') as mock_build:
+            pipeline.run()
+        mock_build.assert_not_called()
+
+    def test_pipeline_batches_frames(self, tmp_video_path, tmp_path, dino_config_path):
+        """Frames reach the filter in batches, with the remainder flushed at the end."""
+        batch_sizes = []
+
+        class _BatchingFilter(IdentityFilter):
+            batch_size = 2
+
+            def process_batch(self, frames):
+                batch_sizes.append(len(frames))
+                return super().process_batch(frames)
+
+        output_path = tmp_path / 'output.mp4'
+        pipeline = Pipeline(
+            video_path=str(tmp_video_path),
+            model_path='identity',
+            config_path=str(dino_config_path),
+            output_path=str(output_path),
+        )
+        with patch('filterworld.pipeline.build_filter', return_value=_BatchingFilter()):
+            pipeline.run()
+        assert batch_sizes == [2, 2, 1]
+        assert output_path.exists()
+
+    def test_pipeline_invalid_batch_size_raises(self, tmp_video_path, tmp_path):
+        """A batch_size below 1 raises ValueError."""
+        with pytest.raises(ValueError, match='batch_size must be at least 1'):
+            Pipeline(
+                video_path=str(tmp_video_path),
+                model_path='identity',
+                config_path=None,
+                output_path=str(tmp_path / 'output.mp4'),
+                batch_size=0,
+            )
+
+    def test_pipeline_batch_size_override(self, tmp_video_path, tmp_path, dino_config_path):
+        """A pipeline batch_size is passed to the filter when it is built."""
+        batch_sizes = []
+
+        class _BatchingFilter(IdentityFilter):
+            batch_size = 3
+
+            def process_batch(self, frames):
+                batch_sizes.append(len(frames))
+                return super().process_batch(frames)
+
+        pipeline = Pipeline(
+            video_path=str(tmp_video_path),
+            model_path='identity',
+            config_path=str(dino_config_path),
+            output_path=str(tmp_path / 'output.mp4'),
+            batch_size=3,
+        )
+        with patch(
+            'filterworld.pipeline.build_filter', return_value=_BatchingFilter(),
+        ) as mock_build:
+            pipeline.run()
+        mock_build.assert_called_once_with('identity', resolution=None, batch_size=3)
+        assert batch_sizes == [3, 2]
@@ -1,11 +1,13 @@
 """Tests for filterworld.precompute."""
 
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 import numpy as np
+import pytest
 
 from filterworld.filters.base import FeatureOutput, Filter
-from filterworld.precompute import precompute_pca
+from filterworld.media.video import VideoReader
+from filterworld.precompute import _fit_pca, precompute_features, precompute_pca
 
 
 class _FakeFilter(Filter):
@@ -46,3 +48,136 @@ class TestPrecomputePca:
         assert 'mean' in data
         assert data['components'].shape == (3, 384)
         assert data['mean'].shape == (384,)
+
+    def test_precompute_pca_batches_frames(self, tmp_video_path, tmp_path):
+        """Selected frames reach the filter in batches of batch_size."""
+        batch_sizes = []
+
+        class _BatchingFilter(_FakeFilter):
+            def process_batch(self, frames):
+                batch_sizes.append(len(frames))
+                return super().process_batch(frames)
+
+        with patch('filterworld.precompute.build_filter', return_value=_BatchingFilter()):
+            precompute_pca(
+                video_path=str(tmp_video_path),
+                model_path='fake',
+                output_path=str(tmp_path / 'pca.npz'),
+                max_frames=4,
+                batch_size=3,
+            )
+        assert batch_sizes == [3, 1]
+
+    def test_precompute_pca_invalid_batch_size_raises(self, tmp_video_path, tmp_path):
+        """A batch_size below 1 raises ValueError."""
+        with pytest.raises(ValueError, match='batch_size must be at least 1'):
+            precompute_pca(
+                video_path=str(tmp_video_path),
+                model_path='fake',
+                output_path=str(tmp_path / 'pca.npz'),
+                batch_size=0,
+            )
+
+    def test_precompute_pca_no_frames_raises(self, tmp_video_path, tmp_path):
+        """A video with no readable frames raises ValueError."""
+        with patch(
+            'filterworld.precompute.build_filter', return_value=_FakeFilter(),
+        ), patch.object(VideoReader, 'read_frame', side_effect=IndexError('no frame')):
+            with pytest.raises(ValueError, match='no frames could be read'):
+                precompute_pca(
+                    video_path=str(tmp_video_path),
+                    model_path='fake',
+                    output_path=str(tmp_path / 'pca.npz'),
+                )
+
+
+class TestFitPca:
+    """Test the function _fit_pca."""
+
+    def test_fit_pca_matches_sklearn(self):
+        """Components and mean from streamed moments match sklearn's PCA."""
+        from sklearn.decomposition import PCA
+
+        rng = np.random.default_rng(0)
+        data = rng.standard_normal((2000, 16)) @ rng.standard_normal((16, 16)) + 3.0
+        shift = data[:10].mean(axis=0)
+        shifted = data - shift
+        components, mean = _fit_pca(
+            shifted.sum(axis=0), shifted.T @ shifted, len(data), shift, n_components=3,
+        )
+        pca = PCA(n_components=3).fit(data)
+        np.testing.assert_allclose(components, pca.components_, atol=1e-6)
+        np.testing.assert_allclose(mean, pca.mean_, atol=1e-9)
+
+
+class TestPrecomputeFeatures:
+    """Test the function precompute_features."""
+
+    def test_precompute_features_produces_npy(self, tmp_video_path, tmp_path):
+        """precompute_features saves one float16 feature row per frame."""
+        output_path = tmp_path / 'features.npy'
+
+        with patch(
+            'filterworld.precompute.build_filter',
+            return_value=_FakeFilter(),
+        ):
+            precompute_features(
+                video_path=str(tmp_video_path),
+                model_path='fake',
+                output_path=str(output_path),
+                batch_size=2,
+            )
+
+        features = np.load(output_path)
+        assert features.shape == (5, 384, 4, 4)
+        assert features.dtype == np.float16
+
+    @pytest.mark.parametrize('reported_count', [0, 2, 9])
+    def test_precompute_features_ignores_reported_count(
+        self, tmp_video_path, tmp_path, reported_count,
+    ):
+        """The file holds every decoded frame, whatever count the container reports."""
+        output_path = tmp_path / 'features.npy'
+
+        with patch(
+            'filterworld.precompute.build_filter', return_value=_FakeFilter(),
+        ), patch.object(
+            VideoReader, 'frame_count', new_callable=PropertyMock, return_value=reported_count,
+        ):
+            precompute_features(
+                video_path=str(tmp_video_path),
+                model_path='fake',
+                output_path=str(output_path),
+                batch_size=2,
+            )
+
+        assert np.load(output_path).shape == (5, 384, 4, 4)
+        assert not (tmp_path / 'features.npy.partial').exists()
+
+    def test_precompute_features_invalid_batch_size_raises(self, tmp_video_path, tmp_path):
+        """A batch_size below 1 raises ValueError."""
+        with pytest.raises(ValueError, match='batch_size must be at least 1'):
+            precompute_features(
+                video_path=str(tmp_video_path),
+                model_path='fake',
+                output_path=str(tmp_path / 'features.npy'),
+                batch_size=0,
+            )
+
+    def test_precompute_features_requires_npy(self, tmp_video_path, tmp_path):
+        """A non-.npy output path raises ValueError."""
+        with pytest.raises(ValueError, match='must end in .npy'):
+            precompute_features(
+                video_path=str(tmp_video_path),
+                model_path='fake',
+                output_path=str(tmp_path / 'features.npz'),
+            )
+
+    def test_precompute_features_rejects_non_feature_models(self, tmp_video_path, tmp_path):
+        """Models without feature outputs raise ValueError."""
+        with pytest.raises(ValueError, match='does not produce features'):
+            precompute_features(
+                video_path=str(tmp_video_path),
+                model_path='identity',
+                output_path=str(tmp_path / 'features.npy'),
+            )
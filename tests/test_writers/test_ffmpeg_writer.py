@@ -0,0 +1,78 @@
+"""Tests for filterworld.writers.ffmpeg_writer."""
+
+import shutil
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+from filterworld.writers.ffmpeg_writer import FFmpegWriter
+
+
+def _fake_ffmpeg(tmp_path, body):
+    """Write an executable stand-in for ffmpeg that runs a Python body."""
+    path = tmp_path / 'ffmpeg'
+    path.write_text(f'#!{sys.executable}\nimport sys\n{body}\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestFFmpegWriter:
+    """Test the class FFmpegWriter."""
+
+    def test_ffmpeg_writer_streams_raw_rgb(self, tmp_path):
+        """Frames reach ffmpeg's stdin as raw RGB bytes, in order."""
+        ffmpeg = _fake_ffmpeg(
+            tmp_path, "open(sys.argv[-1], 'wb').write(sys.stdin.buffer.read())",
+        )
+        output_path = tmp_path / 'output.mp4'
+        writer = FFmpegWriter(str(output_path), ffmpeg=ffmpeg)
+        frames = [np.full((4, 6, 3), idx, dtype=np.uint8) for idx in range(3)]
+        frames[1][..., 0] = 255
+        for frame in frames:
+            writer.write_frame(frame)
+        writer.close()
+
+        assert writer.frame_count == 3
+        written = np.frombuffer(output_path.read_bytes(), dtype=np.uint8)
+        np.testing.assert_array_equal(written.reshape(3, 4, 6, 3), np.stack(frames))
+
+    def test_ffmpeg_writer_verbose_stderr_does_not_block(self, tmp_path):
+        """ffmpeg output well beyond a pipe buffer does not stall the frame writes."""
+        ffmpeg = _fake_ffmpeg(
+            tmp_path,
+            "while sys.stdin.buffer.read(48):\n    sys.stderr.write('x' * 65536)",
+        )
+        writer = FFmpegWriter(str(tmp_path / 'output.mp4'), ffmpeg=ffmpeg)
+        for _ in range(8):
+            writer.write_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+        writer.close()
+        assert writer.frame_count == 8
+
+    def test_ffmpeg_writer_reports_failure(self, tmp_path):
+        """A failing ffmpeg process raises with its error output."""
+        ffmpeg = _fake_ffmpeg(
+            tmp_path, "sys.stdin.buffer.read(); sys.stderr.write('unknown encoder'); sys.exit(1)",
+        )
+        writer = FFmpegWriter(str(tmp_path / 'output.mp4'), ffmpeg=ffmpeg)
+        writer.write_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+        with pytest.raises(RuntimeError, match='unknown encoder'):
+            writer.close()
+
+    def test_ffmpeg_writer_missing_executable(self, tmp_path):
+        """A missing ffmpeg executable raises RuntimeError."""
+        writer = FFmpegWriter(str(tmp_path / 'output.mp4'), ffmpeg='no-such-ffmpeg')
+        with pytest.raises(RuntimeError, match='not found'):
+            writer.write_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    @pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg not installed')
+    def test_ffmpeg_writer_video_file(self, tmp_path):
+        """A real ffmpeg produces a readable video."""
+        output_path = tmp_path / 'output.mp4'
+        with FFmpegWriter(str(output_path), fps=30.0) as writer:
+            for _ in range(3):
+                writer.write_frame(np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8))
+        cap = cv2.VideoCapture(str(output_path))
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 3
+        cap.release()
@@ -0,0 +1,67 @@
+"""Tests for filterworld.writers.threaded_writer."""
+
+import numpy as np
+import pytest
+
+from filterworld.writers.base import Writer
+from filterworld.writers.threaded_writer import ThreadedWriter
+from filterworld.writers.video_writer import VideoWriter
+
+
+class _ListWriter(Writer):
+    """Collects written frames in memory."""
+
+    def __init__(self, fail_at: int | None = None) -> None:
+        self.frames = []
+        self.closed = False
+        self._fail_at = fail_at
+
+    def write_frame(self, frame):
+        if len(self.frames) == self._fail_at:
+            raise OSError('disk full')
+        self.frames.append(frame)
+
+    def close(self):
+        self.closed = True
+
+
+class TestThreadedWriter:
+    """Test the class ThreadedWriter."""
+
+    def test_threaded_writer_writes_in_order(self):
+        """Frames reach the wrapped writer in order before close returns."""
+        inner = _ListWriter()
+        writer = ThreadedWriter(inner, maxsize=2)
+        for idx in range(10):
+            writer.write_frame(np.full((4, 4, 3), idx, dtype=np.uint8))
+        writer.close()
+        assert inner.closed
+        assert [int(frame[0, 0, 0]) for frame in inner.frames] == list(range(10))
+
+    def test_threaded_writer_copies_frames(self):
+        """Reusing the submitted buffer does not alter queued frames."""
+        inner = _ListWriter()
+        writer = ThreadedWriter(inner)
+        buffer = np.zeros((4, 4, 3), dtype=np.uint8)
+        writer.write_frame(buffer)
+        buffer[:] = 255
+        writer.close()
+        assert np.all(inner.frames[0] == 0)
+
+    def test_threaded_writer_reraises_errors(self):
+        """Errors in the writer thread surface in the caller."""
+        writer = ThreadedWriter(_ListWriter(fail_at=1))
+        with pytest.raises(OSError, match='disk full'):
+            for _ in range(50):
+                writer.write_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+            writer.close()
+
+    def test_threaded_writer_video_file(self, tmp_path):
+        """Wrapping a VideoWriter produces the output file."""
+        output_path = tmp_path / 'output.mp4'
+        inner = VideoWriter(str(output_path), fps=30.0)
+        with ThreadedWriter(inner) as writer:
+            for _ in range(3):
+                writer.write_frame(np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8))
+        assert output_path.exists()
+        assert inner.frame_count == 3
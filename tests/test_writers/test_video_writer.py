@@ -1,5 +1,6 @@
 """Tests for filterworld.writers.video_writer."""
 
+import cv2
 import numpy as np
 
 from filterworld.writers.video_writer import VideoWriter
@@ -28,3 +29,15 @@ class TestVideoWriter:
         writer.write_frame(frame)
         writer.close()
         writer.close()  # should not raise
+
+    def test_video_writer_software_encode(self, tmp_path):
+        """Hardware encoding can be turned off, with the same frames written."""
+        output_path = tmp_path / 'output.mp4'
+        writer = VideoWriter(str(output_path), fps=30.0, hw_accel=False)
+        for _ in range(3):
+            writer.write_frame(np.zeros((64, 64, 3), dtype=np.uint8))
+        writer.close()
+
+        cap = cv2.VideoCapture(str(output_path))
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 3
+        cap.release()